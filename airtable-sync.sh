@@ -6,7 +6,8 @@
 #
 # Usage:
 #   ./airtable-sync.sh setup      # Interactive setup
-#   ./airtable-sync.sh sync       # Full sync
+#   ./airtable-sync.sh sync       # Sync changes since last run
+#   ./airtable-sync.sh sync --full  # Resync everything
 #   ./airtable-sync.sh today      # Sync today only
 #   ./airtable-sync.sh status     # Check status
 #   ./airtable-sync.sh install    # Add to daily cron
@@ -60,8 +61,8 @@ setup() {
 
 sync_all() {
     check_deps
-    echo -e "${YELLOW}🔄 Running full Airtable sync...${NC}"
-    python3 "$PYTHON_SCRIPT" --sync 2>&1 | tee -a "$LOG_FILE"
+    echo -e "${YELLOW}🔄 Running Airtable sync...${NC}"
+    python3 "$PYTHON_SCRIPT" --sync "$@" 2>&1 | tee -a "$LOG_FILE"
 }
 
 sync_today() {
@@ -101,7 +102,7 @@ show_help() {
     echo ""
     echo "Commands:"
     echo "  setup     Interactive setup wizard (API key, Base ID)"
-    echo "  sync      Run full sync to Airtable"
+    echo "  sync      Sync changes since last run (sync --full to resync all)"
     echo "  today     Sync only today's sessions"
     echo "  status    Check Airtable sync status"
     echo "  install   Add daily sync to cron jobs"
@@ -128,7 +129,7 @@ case "${1:-help}" in
         setup
         ;;
     sync)
-        sync_all
+        sync_all "${@:2}"
         ;;
     today)
         sync_today
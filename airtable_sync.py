@@ -15,9 +15,11 @@ Features:
 
 Usage:
     python3 airtable_sync.py --init          # Create tables in Airtable
-    python3 airtable_sync.py --sync          # Sync all data
+    python3 airtable_sync.py --sync          # Sync changes since last sync
+    python3 airtable_sync.py --sync --full   # Resync all data
     python3 airtable_sync.py --sync-today    # Sync today's sessions only
     python3 airtable_sync.py --status        # Check sync status
+    python3 airtable_sync.py --status --refresh-counts  # Recount Airtable records
 
 Environment Variables:
     AIRTABLE_API_KEY     - Your Airtable Personal Access Token
@@ -35,26 +37,86 @@ import os
 import json
 import sqlite3
 import hashlib
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, asdict, field
+from typing import Optional, List, Dict, Any, Iterator
+from itertools import islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
+import threading
 import time
 
 try:
     from pyairtable import Api, Table
-    from pyairtable.formulas import match
+    from requests.adapters import HTTPAdapter
     AIRTABLE_AVAILABLE = True
 except ImportError:
     AIRTABLE_AVAILABLE = False
     print("⚠️  pyairtable not installed. Run: pip install pyairtable")
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Configuration
 BACKUP_PATH = Path.home() / "copilot-chat-backups"
 DB_PATH = BACKUP_PATH / "backup_tracking.db"
 CONFIG_PATH = Path(__file__).parent / "airtable_config.json"
 
+# Airtable accepts at most 10 records per create/update/upsert request
+BATCH_SIZE = 10
+# Airtable allows 5 requests/second per base
+MAX_REQUESTS_PER_SECOND = 5
+SYNC_WORKERS = 5
+# Rows pulled from SQLite per fetchmany() call
+DB_FETCH_SIZE = 1000
+
+# Keywords that imply each Q&A tag, in tag priority order
+TAG_KEYWORDS = {
+    'debugging': ['error', 'fix', 'bug', 'issue', 'fail'],
+    'implementation': ['implement', 'create', 'add', 'build'],
+    'architecture': ['architect', 'design', 'structure', 'pattern'],
+    'configuration': ['config', 'setting', 'env', 'setup'],
+    'documentation': ['doc', 'readme', 'comment', 'explain'],
+    'refactoring': ['refactor', 'clean', 'improve', 'optimize'],
+    'testing': ['test', 'spec', 'mock', 'assert'],
+}
+
+# Project categories, in priority order. Each alternative is a lookahead
+# anchored at the start, so the first category that matches anywhere in
+# the name wins (same precedence as a chain of `in` checks).
+PROJECT_CATEGORIES = ('aiconnects', 'smart-spending', 'howaiconnects', 'infrastructure')
+_CATEGORY_RE = re.compile(
+    r"(?=.*(aiconnects))"
+    r"|(?=.*(smart-spending|s-s-h))"
+    r"|(?=.*(howaiconnects))"
+    r"|(?=.*(infra|azure|docker|k8s))",
+    re.IGNORECASE | re.DOTALL
+)
+
+@lru_cache(maxsize=1024)
+def _categorize(name: str) -> str:
+    """Categorize project by name (memoized; names recur across rows)."""
+    m = _CATEGORY_RE.match(name)
+    if m:
+        return PROJECT_CATEGORIES[m.lastindex - 1]
+    return 'other'
+
+
+# Markers that indicate an answer contains code
+_CODE_RE = re.compile(r"```|function |const |import |def |class ")
+
 # Table schemas
 TABLES_SCHEMA = {
     "Sessions": {
@@ -153,6 +215,24 @@ TABLES_SCHEMA = {
 }
 
 
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least 1/rate seconds apart."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 @dataclass
 class AirtableConfig:
     api_key: str
@@ -160,6 +240,8 @@ class AirtableConfig:
     table_ids: Dict[str, str]
     last_sync: Optional[str] = None
     sync_count: int = 0
+    record_counts: Dict[str, int] = field(default_factory=dict)
+    counts_updated: Optional[str] = None
 
 
 class AirtableChatSync:
@@ -169,11 +251,28 @@ class AirtableChatSync:
         self.config = self._load_config()
         self.api = None
         self.tables: Dict[str, Table] = {}
+        self._limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+        self._tag_ac = self._build_tag_automaton()
+        self._conn: Optional[sqlite3.Connection] = None
         
         if self.config and AIRTABLE_AVAILABLE:
-            self.api = Api(self.config.api_key)
+            self.api = self._make_api(self.config.api_key)
             self._init_tables()
     
+    @staticmethod
+    def _make_api(api_key: str) -> "Api":
+        """Create the Airtable client with a connection pool sized for the sync workers."""
+        api = Api(api_key)
+        # Keep pyairtable's retry policy (it mounts its own adapter); only widen the pool
+        # so concurrent batch requests reuse keep-alive connections instead of reconnecting.
+        retries = api.session.get_adapter("https://api.airtable.com").max_retries
+        api.session.mount("https://", HTTPAdapter(
+            pool_connections=SYNC_WORKERS,
+            pool_maxsize=SYNC_WORKERS,
+            max_retries=retries
+        ))
+        return api
+    
     def _load_config(self) -> Optional[AirtableConfig]:
         """Load configuration from file or environment."""
         # Try environment variables first
@@ -191,7 +290,9 @@ class AirtableChatSync:
                     base_id=base_id,
                     table_ids=data.get("table_ids", {}),
                     last_sync=data.get("last_sync"),
-                    sync_count=data.get("sync_count", 0)
+                    sync_count=data.get("sync_count", 0),
+                    record_counts=data.get("record_counts", {}),
+                    counts_updated=data.get("counts_updated")
                 )
         
         if api_key and base_id:
@@ -207,7 +308,9 @@ class AirtableChatSync:
                 "base_id": self.config.base_id,
                 "table_ids": self.config.table_ids,
                 "last_sync": self.config.last_sync,
-                "sync_count": self.config.sync_count
+                "sync_count": self.config.sync_count,
+                "record_counts": self.config.record_counts,
+                "counts_updated": self.config.counts_updated
             }
             with open(CONFIG_PATH, 'w') as f:
                 json.dump(data, f, indent=2)
@@ -260,7 +363,7 @@ class AirtableChatSync:
         # Test connection
         print("\n🔄 Testing connection...")
         try:
-            self.api = Api(api_key)
+            self.api = self._make_api(api_key)
             base = self.api.base(base_id)
             print(f"✅ Connected to base: {base_id}")
         except Exception as e:
@@ -287,13 +390,19 @@ class AirtableChatSync:
         
         base = self.api.base(self.config.base_id)
         
+        # Fetch the base schema once rather than per table
+        try:
+            existing_tables = {t.name: t for t in base.schema().tables}
+        except Exception as e:
+            print(f"  ❌ Error reading base schema: {e}")
+            return False
+        
         for table_name, schema in TABLES_SCHEMA.items():
             print(f"  Creating '{table_name}'...")
             
             try:
                 # Check if table already exists
-                existing_tables = base.schema().tables
-                existing = next((t for t in existing_tables if t.name == table_name), None)
+                existing = existing_tables.get(table_name)
                 
                 if existing:
                     print(f"    ⚠️  Table already exists (ID: {existing.id})")
@@ -318,83 +427,183 @@ class AirtableChatSync:
         print("\n✅ Tables configured!")
         return True
     
-    def _get_sessions_from_db(self, since: Optional[datetime] = None) -> List[Dict]:
-        """Get sessions from SQLite database."""
-        if not DB_PATH.exists():
-            return []
+    def _db(self) -> Optional[sqlite3.Connection]:
+        """Return the shared tracking-database connection, opening it once."""
+        if self._conn is None:
+            if not DB_PATH.exists():
+                return None
+            self._conn = sqlite3.connect(DB_PATH, isolation_level=None)
+            self._conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-65536;
+                PRAGMA temp_store=MEMORY;
+            """)
+            self._ensure_indexes()
+        return self._conn
+    
+    def _ensure_indexes(self):
+        """Create the indexes the sync queries rely on.
+        
+        idx_sessions_ts serves the `since` and daily range filters;
+        idx_sessions_project_ts serves the per-project GROUP BY. A partial
+        "recent rows" index isn't used: SQLite requires its WHERE clause to
+        be deterministic, so it can't reference date('now').
+        """
+        self._conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_ts ON sessions(timestamp);
+            CREATE INDEX IF NOT EXISTS idx_sessions_project_ts ON sessions(project_name, timestamp);
+        """)
+    
+    def close(self):
+        """Close the tracking-database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _iter_sessions_from_db(self, since: Optional[datetime] = None) -> Iterator[tuple]:
+        """Stream sessions from SQLite database in batches.
+        
+        Rows are plain tuples in the column order of the SELECT below.
+        """
+        conn = self._db()
+        if conn is None:
+            return
         
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
+        # Truncation and date slicing happen in SQL so rows arrive Airtable-sized
+        columns = """
+            session_id, project_name, workspace_id,
+            substr(timestamp, 1, 10) AS date,
+            message_count,
+            substr(first_message, 1, 1000) AS first_message_short,
+            file_path, content_hash
+        """
+        
         if since:
-            cursor.execute("""
-                SELECT * FROM sessions 
+            cursor.execute(f"""
+                SELECT {columns} FROM sessions 
                 WHERE timestamp >= ?
                 ORDER BY timestamp DESC
             """, (since.isoformat(),))
         else:
-            cursor.execute("SELECT * FROM sessions ORDER BY timestamp DESC")
+            cursor.execute(f"SELECT {columns} FROM sessions ORDER BY timestamp DESC")
         
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        while True:
+            rows = cursor.fetchmany(DB_FETCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    
+    def _iter_qa_pairs(self) -> Iterator[Dict]:
+        """Stream Q&A pairs from JSONL export."""
+        qa_path = BACKUP_PATH / "ai-export" / "qa_pairs.jsonl"
+        if not qa_path.exists():
+            return
         
-        return rows
+        with open(qa_path, 'rb') as f:
+            for line in f:
+                try:
+                    yield _json_loads(line)
+                except ValueError:
+                    continue
     
-    def _get_qa_pairs(self) -> List[Dict]:
-        """Get Q&A pairs from JSONL export."""
+    def _count_qa_pairs_on(self, date_str: str) -> int:
+        """Count Q&A pairs for a date without loading the whole export."""
         qa_path = BACKUP_PATH / "ai-export" / "qa_pairs.jsonl"
         if not qa_path.exists():
-            return []
+            return 0
         
-        pairs = []
-        with open(qa_path) as f:
+        needle = date_str.encode()
+        count = 0
+        with open(qa_path, 'rb') as f:
             for line in f:
+                # Cheap prefilter: only parse lines mentioning the date
+                if needle not in line:
+                    continue
                 try:
-                    pairs.append(json.loads(line))
-                except json.JSONDecodeError:
+                    if _json_loads(line).get("date") == date_str:
+                        count += 1
+                except ValueError:
                     continue
         
-        return pairs
+        return count
     
     def _categorize_project(self, name: str) -> str:
         """Categorize project by name."""
-        name_lower = name.lower()
-        if 'aiconnects' in name_lower:
-            return 'aiconnects'
-        elif 'smart-spending' in name_lower or 's-s-h' in name_lower:
-            return 'smart-spending'
-        elif 'howaiconnects' in name_lower:
-            return 'howaiconnects'
-        elif any(x in name_lower for x in ['infra', 'azure', 'docker', 'k8s']):
-            return 'infrastructure'
-        return 'other'
+        return _categorize(name or "")
+    
+    @staticmethod
+    def _build_tag_automaton():
+        """Build one Aho-Corasick automaton over all tag keywords, if available."""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for tag, keywords in TAG_KEYWORDS.items():
+            for keyword in keywords:
+                automaton.add_word(keyword, tag)
+        automaton.make_automaton()
+        return automaton
     
     def _detect_tags(self, question: str, answer: str) -> List[str]:
         """Detect tags based on content."""
         text = (question + " " + answer).lower()
-        tags = []
-        
-        if any(x in text for x in ['error', 'fix', 'bug', 'issue', 'fail']):
-            tags.append('debugging')
-        if any(x in text for x in ['implement', 'create', 'add', 'build']):
-            tags.append('implementation')
-        if any(x in text for x in ['architect', 'design', 'structure', 'pattern']):
-            tags.append('architecture')
-        if any(x in text for x in ['config', 'setting', 'env', 'setup']):
-            tags.append('configuration')
-        if any(x in text for x in ['doc', 'readme', 'comment', 'explain']):
-            tags.append('documentation')
-        if any(x in text for x in ['refactor', 'clean', 'improve', 'optimize']):
-            tags.append('refactoring')
-        if any(x in text for x in ['test', 'spec', 'mock', 'assert']):
-            tags.append('testing')
         
+        if self._tag_ac is not None:
+            # Single pass over the text reports every keyword hit
+            found = {tag for _, tag in self._tag_ac.iter(text)}
+        else:
+            found = {tag for tag, keywords in TAG_KEYWORDS.items()
+                     if any(x in text for x in keywords)}
+        
+        tags = [tag for tag in TAG_KEYWORDS if tag in found]
         return tags[:3]  # Limit to 3 tags
     
     def _has_code(self, text: str) -> bool:
         """Check if text contains code."""
-        return '```' in text or any(x in text for x in ['function ', 'const ', 'import ', 'def ', 'class '])
+        return _CODE_RE.search(text) is not None
+    
+    def _batch_upsert(self, table: "Table", records: List[Dict], key_field: str) -> int:
+        """Upsert records in batches of 10, keyed on a unique field.
+        
+        Replaces the per-record lookup + create/update round-trips; Airtable
+        matches on ``key_field`` server-side, so each request handles 10 rows.
+        Batches are sent from a small thread pool, throttled to the base's
+        5 requests/second limit.
+        """
+        chunks = [records[i:i + BATCH_SIZE] for i in range(0, len(records), BATCH_SIZE)]
+        
+        def upsert(chunk: List[Dict]) -> int:
+            self._limiter.wait()
+            table.batch_upsert(chunk, key_fields=[key_field], typecast=True)
+            return len(chunk)
+        
+        synced = 0
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as executor:
+            futures = {executor.submit(upsert, chunk): n for n, chunk in enumerate(chunks, 1)}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    synced += future.result()
+                except Exception as e:
+                    print(f"  ⚠️  Error syncing batch {futures[future]}: {e}")
+                
+                # Progress
+                if len(records) > 50 and done % 5 == 0:
+                    print(f"  ... {synced}/{len(records)}")
+        
+        return synced
+    
+    def _fetch_existing(self, table: "Table", key_field: str, fields: List[str]) -> Dict[str, Dict]:
+        """Map each existing record's key to its fields, fetching only ``fields``."""
+        existing = {}
+        for record in table.all(page_size=100, fields=[key_field] + fields):
+            record_fields = record.get("fields", {})
+            key = record_fields.get(key_field)
+            if key:
+                existing[key] = record_fields
+        return existing
     
     def sync_sessions(self, since: Optional[datetime] = None):
         """Sync sessions to Airtable."""
@@ -403,108 +612,93 @@ class AirtableChatSync:
             return 0
         
         table = self.tables["Sessions"]
-        sessions = self._get_sessions_from_db(since)
-        
-        print(f"\n📤 Syncing {len(sessions)} sessions...")
+        sessions = self._iter_sessions_from_db(since)
         
-        synced = 0
-        for session in sessions:
-            try:
-                # Check if already exists
-                existing = table.all(formula=match({"Session ID": session.get("session_id", "")}))
-                
-                record = {
-                    "Session ID": session.get("session_id", ""),
-                    "Project": session.get("project_name", "unknown"),
-                    "Workspace": session.get("workspace_id", ""),
-                    "Date": session.get("timestamp", "")[:10] if session.get("timestamp") else None,
-                    "Messages": session.get("message_count", 0),
-                    "First Message": (session.get("first_message", "") or "")[:1000],
-                    "Category": self._categorize_project(session.get("project_name", "")),
-                    "Status": "Active",
-                    "Last Synced": datetime.now().isoformat(),
-                    "File Path": session.get("file_path", ""),
-                    "Hash": session.get("content_hash", "")
-                }
-                
-                if existing:
-                    # Update existing
-                    table.update(existing[0]["id"], record)
-                else:
-                    # Create new
-                    table.create(record)
-                
-                synced += 1
-                
-                # Rate limiting
-                if synced % 5 == 0:
-                    time.sleep(0.2)
-                    
-            except Exception as e:
-                print(f"  ⚠️  Error syncing session: {e}")
-        
-        return synced
+        # Prefetch stored hashes so unchanged sessions are not re-sent
+        try:
+            existing = self._fetch_existing(table, "Session ID", ["Hash"])
+        except Exception as e:
+            print(f"  ⚠️  Could not fetch existing sessions: {e}")
+            existing = {}
+        
+        sync_ts = datetime.now().isoformat()
+        records = []
+        total = 0
+        for (session_id, project, workspace, date, message_count,
+             first_message, file_path, content_hash) in sessions:
+            total += 1
+            stored = existing.get(session_id or "")
+            if stored and stored.get("Hash") == content_hash:
+                continue
+            
+            records.append({"fields": {
+                "Session ID": session_id or "",
+                "Project": project or "unknown",
+                "Workspace": workspace or "",
+                "Date": date or None,
+                "Messages": message_count or 0,
+                "First Message": first_message or "",
+                "Category": self._categorize_project(project),
+                "Status": "Active",
+                "Last Synced": sync_ts,
+                "File Path": file_path or "",
+                "Hash": content_hash or ""
+            }})
+        
+        print(f"\n📤 Syncing {len(records)} sessions "
+              f"({total - len(records)} unchanged)...")
+        return self._batch_upsert(table, records, "Session ID")
     
-    def sync_qa_pairs(self, limit: int = 500):
+    def sync_qa_pairs(self, limit: int = 500, since: Optional[datetime] = None):
         """Sync Q&A pairs to Airtable."""
         if "QA_Pairs" not in self.tables:
             print("❌ QA_Pairs table not configured")
             return 0
         
         table = self.tables["QA_Pairs"]
-        pairs = self._get_qa_pairs()[:limit]  # Limit to avoid rate limits
-        
-        print(f"\n📤 Syncing {len(pairs)} Q&A pairs...")
-        
-        synced = 0
-        for i, pair in enumerate(pairs):
-            try:
-                qa_id = hashlib.md5(
-                    f"{pair.get('project', '')}{pair.get('question', '')[:100]}".encode()
-                ).hexdigest()[:12]
-                
-                # Check if exists
-                existing = table.all(formula=match({"ID": qa_id}))
-                
-                question = pair.get("question", "")[:2000]
-                answer = pair.get("answer", "")[:2000]
-                
-                record = {
-                    "ID": qa_id,
-                    "Project": pair.get("project", "unknown"),
-                    "Date": pair.get("date"),
-                    "Question": question,
-                    "Answer": answer,
-                    "Question Length": len(question),
-                    "Answer Length": len(answer),
-                    "Has Code": self._has_code(answer),
-                    "Tags": self._detect_tags(question, answer),
-                    "Quality": "Unrated",
-                    "Useful for Training": False
-                }
-                
-                if existing:
-                    table.update(existing[0]["id"], record)
-                else:
-                    table.create(record)
-                
-                synced += 1
-                
-                # Progress
-                if synced % 50 == 0:
-                    print(f"  ... {synced}/{len(pairs)}")
-                
-                # Rate limiting
-                if synced % 5 == 0:
-                    time.sleep(0.2)
-                    
-            except Exception as e:
-                print(f"  ⚠️  Error syncing Q&A: {e}")
         
-        return synced
+        # Skip entirely if the export hasn't been rewritten since `since`
+        qa_path = BACKUP_PATH / "ai-export" / "qa_pairs.jsonl"
+        if since and qa_path.exists():
+            if datetime.fromtimestamp(qa_path.stat().st_mtime) < since:
+                print("\n📤 Q&A pairs unchanged since last sync, skipping")
+                return 0
+        
+        pairs = islice(self._iter_qa_pairs(), limit)  # Limit to avoid rate limits
+        
+        records = []
+        for pair in pairs:
+            qa_id = hashlib.blake2b(
+                f"{pair.get('project', '')}{pair.get('question', '')[:100]}".encode(),
+                digest_size=6
+            ).hexdigest()
+            
+            question = pair.get("question", "")[:2000]
+            answer = pair.get("answer", "")[:2000]
+            
+            records.append({"fields": {
+                "ID": qa_id,
+                "Project": pair.get("project", "unknown"),
+                "Date": pair.get("date"),
+                "Question": question,
+                "Answer": answer,
+                "Question Length": len(question),
+                "Answer Length": len(answer),
+                "Has Code": self._has_code(answer),
+                "Tags": self._detect_tags(question, answer),
+                "Quality": "Unrated",
+                "Useful for Training": False
+            }})
+        
+        print(f"\n📤 Syncing {len(records)} Q&A pairs...")
+        return self._batch_upsert(table, records, "ID")
     
-    def sync_projects(self):
-        """Sync project summary to Airtable."""
+    def sync_projects(self, since: Optional[datetime] = None):
+        """Sync project summary to Airtable.
+        
+        With ``since``, only projects that have sessions at or after it are
+        recomputed and sent.
+        """
         if "Projects" not in self.tables:
             print("❌ Projects table not configured")
             return 0
@@ -512,10 +706,10 @@ class AirtableChatSync:
         table = self.tables["Projects"]
         
         # Get project stats from database
-        if not DB_PATH.exists():
+        conn = self._db()
+        if conn is None:
             return 0
         
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -527,43 +721,27 @@ class AirtableChatSync:
                 MAX(timestamp) as last_activity
             FROM sessions
             GROUP BY project_name
+            HAVING :since IS NULL OR MAX(timestamp) >= :since
             ORDER BY sessions DESC
-        """)
+        """, {"since": since.isoformat() if since else None})
         
         projects = cursor.fetchall()
-        conn.close()
         
         print(f"\n📤 Syncing {len(projects)} projects...")
         
-        synced = 0
-        for project in projects:
-            name, sessions, messages, first_act, last_act = project
-            
-            try:
-                existing = table.all(formula=match({"Name": name}))
-                
-                record = {
-                    "Name": name,
-                    "Category": self._categorize_project(name),
-                    "Total Sessions": sessions,
-                    "Total Messages": messages or 0,
-                    "First Activity": first_act[:10] if first_act else None,
-                    "Last Activity": last_act[:10] if last_act else None,
-                    "Status": "Active"
-                }
-                
-                if existing:
-                    table.update(existing[0]["id"], record)
-                else:
-                    table.create(record)
-                
-                synced += 1
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"  ⚠️  Error syncing project {name}: {e}")
-        
-        return synced
+        records = []
+        for name, sessions, messages, first_act, last_act in projects:
+            records.append({"fields": {
+                "Name": name,
+                "Category": self._categorize_project(name),
+                "Total Sessions": sessions,
+                "Total Messages": messages or 0,
+                "First Activity": first_act[:10] if first_act else None,
+                "Last Activity": last_act[:10] if last_act else None,
+                "Status": "Active"
+            }})
+        
+        return self._batch_upsert(table, records, "Name")
     
     def sync_daily(self, date: Optional[str] = None):
         """Sync daily activity summary."""
@@ -574,12 +752,13 @@ class AirtableChatSync:
         table = self.tables["Daily_Activity"]
         
         target_date = date or datetime.now().strftime("%Y-%m-%d")
+        next_date = (datetime.strptime(target_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
         
         # Get stats for date
-        if not DB_PATH.exists():
+        conn = self._db()
+        if conn is None:
             return 0
         
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -588,11 +767,10 @@ class AirtableChatSync:
                 SUM(message_count) as messages,
                 GROUP_CONCAT(DISTINCT project_name) as projects
             FROM sessions
-            WHERE DATE(timestamp) = ?
-        """, (target_date,))
+            WHERE timestamp >= ? AND timestamp < ?
+        """, (target_date, next_date))
         
         row = cursor.fetchone()
-        conn.close()
         
         if not row or row[0] == 0:
             print(f"  No activity for {target_date}")
@@ -601,10 +779,8 @@ class AirtableChatSync:
         sessions, messages, projects = row
         
         try:
-            existing = table.all(formula=match({"Date": target_date}))
-            
             # Get QA count
-            qa_count = len([p for p in self._get_qa_pairs() if p.get("date") == target_date])
+            qa_count = self._count_qa_pairs_on(target_date)
             
             record = {
                 "Date": target_date,
@@ -615,10 +791,8 @@ class AirtableChatSync:
                 "Productivity Score": min(10, (messages or 0) / 50)  # Simple score
             }
             
-            if existing:
-                table.update(existing[0]["id"], record)
-            else:
-                table.create(record)
+            self._limiter.wait()
+            table.batch_upsert([{"fields": record}], key_fields=["Date"], typecast=True)
             
             print(f"  ✅ Synced daily activity for {target_date}")
             return 1
@@ -627,18 +801,25 @@ class AirtableChatSync:
             print(f"  ⚠️  Error: {e}")
             return 0
     
-    def sync_all(self, since: Optional[datetime] = None):
-        """Run full sync."""
+    def sync_all(self, since: Optional[datetime] = None, full: bool = False):
+        """Run sync.
+        
+        Without an explicit ``since``, only sessions changed after the
+        previous sync are sent; pass ``full=True`` to resync everything.
+        """
+        if since is None and not full and self.config.last_sync:
+            since = datetime.fromisoformat(self.config.last_sync)
+        
         print("\n" + "=" * 60)
-        print("🔄 Airtable Full Sync")
+        print("🔄 Airtable Full Sync" if since is None else f"🔄 Airtable Sync (since {since.isoformat()})")
         print("=" * 60)
         
         start_time = datetime.now()
         
         # Sync all tables
         sessions = self.sync_sessions(since)
-        qa_pairs = self.sync_qa_pairs()
-        projects = self.sync_projects()
+        qa_pairs = self.sync_qa_pairs(since=since)
+        projects = self.sync_projects(since)
         daily = self.sync_daily()
         
         # Update config
@@ -656,8 +837,17 @@ class AirtableChatSync:
         print(f"   Duration: {duration:.1f}s")
         print("=" * 60)
     
-    def show_status(self):
-        """Show sync status."""
+    def _count_records(self, name: str, table: "Table") -> int:
+        """Count a table's records, fetching only its key field."""
+        key_field = TABLES_SCHEMA[name]["fields"][0]["name"]
+        return sum(len(page) for page in table.iterate(page_size=100, fields=[key_field]))
+    
+    def show_status(self, refresh_counts: bool = False):
+        """Show sync status.
+        
+        Record counts are cached in the config; counting pages through every
+        record, so it only happens on ``refresh_counts`` or when no cache exists.
+        """
         print("\n📊 Airtable Sync Status\n")
         
         if not self.config:
@@ -677,14 +867,23 @@ class AirtableChatSync:
         
         print()
         
-        if self.tables:
-            print("Record counts:")
+        if self.tables and (refresh_counts or not self.config.record_counts):
             for name, table in self.tables.items():
                 try:
-                    count = len(table.all())
-                    print(f"  {name}: {count} records")
-                except:
+                    self.config.record_counts[name] = self._count_records(name, table)
+                except Exception:
+                    self.config.record_counts.pop(name, None)
+            self.config.counts_updated = datetime.now().isoformat()
+            self._save_config()
+        
+        if self.config.record_counts:
+            print(f"Record counts (as of {self.config.counts_updated}, --refresh-counts to update):")
+            for name in self.tables or self.config.record_counts:
+                count = self.config.record_counts.get(name)
+                if count is None:
                     print(f"  {name}: Unable to count")
+                else:
+                    print(f"  {name}: {count} records")
 
 
 def main():
@@ -693,11 +892,13 @@ def main():
     )
     parser.add_argument("--setup", action="store_true", help="Interactive setup wizard")
     parser.add_argument("--init", action="store_true", help="Initialize/configure tables")
-    parser.add_argument("--sync", action="store_true", help="Run full sync")
+    parser.add_argument("--sync", action="store_true", help="Sync changes since last sync")
+    parser.add_argument("--full", action="store_true", help="With --sync, resync everything")
     parser.add_argument("--sync-today", action="store_true", help="Sync today's data only")
     parser.add_argument("--sync-sessions", action="store_true", help="Sync sessions only")
     parser.add_argument("--sync-qa", action="store_true", help="Sync Q&A pairs only")
     parser.add_argument("--status", action="store_true", help="Show sync status")
+    parser.add_argument("--refresh-counts", action="store_true", help="With --status, recount Airtable records")
     parser.add_argument("--qa-limit", type=int, default=500, help="Max Q&A pairs to sync")
     
     args = parser.parse_args()
@@ -709,23 +910,26 @@ def main():
     
     sync = AirtableChatSync()
     
-    if args.setup:
-        sync.setup_interactive()
-    elif args.init:
-        sync.init_tables()
-    elif args.sync:
-        sync.sync_all()
-    elif args.sync_today:
-        since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        sync.sync_all(since=since)
-    elif args.sync_sessions:
-        sync.sync_sessions()
-    elif args.sync_qa:
-        sync.sync_qa_pairs(limit=args.qa_limit)
-    elif args.status:
-        sync.show_status()
-    else:
-        parser.print_help()
+    try:
+        if args.setup:
+            sync.setup_interactive()
+        elif args.init:
+            sync.init_tables()
+        elif args.sync:
+            sync.sync_all(full=args.full)
+        elif args.sync_today:
+            since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            sync.sync_all(since=since)
+        elif args.sync_sessions:
+            sync.sync_sessions()
+        elif args.sync_qa:
+            sync.sync_qa_pairs(limit=args.qa_limit)
+        elif args.status:
+            sync.show_status(refresh_counts=args.refresh_counts)
+        else:
+            parser.print_help()
+    finally:
+        sync.close()
 
 
 if __name__ == "__main__":
@@ -5,100 +5,223 @@ Helps identify issues and track extraction progress.
 """
 
 import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Message-count histogram buckets, in display order
+MESSAGE_BUCKETS = ['0 (empty)', '1-5', '6-10', '11-20', '21-50', '50+']
+
+# Rows per fetchmany() batch
+FETCH_SIZE = 1000
+
+# Full-width histogram bar; rows take a slice of it
+BAR_WIDTH = 50
+_BAR = '█' * BAR_WIDTH
+
+# Virtual generated column holding each session's histogram bucket
+MSG_BUCKET_EXPR = """
+    CASE
+        WHEN message_count = 0 THEN '0 (empty)'
+        WHEN message_count BETWEEN 1 AND 5 THEN '1-5'
+        WHEN message_count BETWEEN 6 AND 10 THEN '6-10'
+        WHEN message_count BETWEEN 11 AND 20 THEN '11-20'
+        WHEN message_count BETWEEN 21 AND 50 THEN '21-50'
+        ELSE '50+'
+    END
+"""
+def _connect(db_path):
+    """Open the database tuned for a read-only aggregation pass."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+    """)
+    _ensure_analysis_schema(conn)
+    _refresh_planner_stats(conn)
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+def _ensure_analysis_schema(conn):
+    """Create the msg_bucket column and the indexes that let the histogram,
+    per-workspace and edited-file queries run as index-only scans."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(chat_sessions)")}
+    if 'msg_bucket' not in columns:
+        conn.execute(
+            f"ALTER TABLE chat_sessions ADD COLUMN msg_bucket TEXT "
+            f"GENERATED ALWAYS AS ({MSG_BUCKET_EXPR}) VIRTUAL"
+        )
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_sessions_bucket ON chat_sessions(msg_bucket);
+        CREATE INDEX IF NOT EXISTS idx_sessions_msgcount_ws
+            ON chat_sessions(message_count, workspace_name, last_message_date);
+        CREATE INDEX IF NOT EXISTS idx_sessions_type_editpaths
+            ON chat_sessions(session_type, edit_file_paths)
+            WHERE session_type IN ('code_edit', 'mixed');
+    """)
+
+def _refresh_planner_stats(conn):
+    """Make sure the query planner has statistics for the analysis indexes.
+
+    A full ANALYZE runs the first time (no sqlite_stat1 yet); afterwards
+    PRAGMA optimize only re-analyzes tables whose stats have gone stale.
+    """
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    if has_stats:
+        conn.execute("PRAGMA optimize")
+    else:
+        conn.execute("ANALYZE")
+
+def _load_requests_count(file_path):
+    """Return (exists, request count or exception) for a session file."""
+    path = Path(file_path) if file_path else None
+    if path is None or not path.exists():
+        return False, None
+    try:
+        content = _json_loads(path.read_bytes())
+        return True, len(content.get('requests', ()))
+    except Exception as e:
+        return True, e
+
+def _finish(conn, out):
+    """End the read transaction, close the database and write the report."""
+    conn.execute("COMMIT")
+    conn.close()
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
+
 def analyze_sessions(db_path="copilot_backup.db"):
     """Comprehensive session analysis."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    conn = _connect(db_path)
+    # Report lines are collected and written to stdout in one call at the end
+    out = []
     cursor = conn.cursor()
+    # fetchmany() pulls this many rows per call into Python
+    cursor.arraysize = FETCH_SIZE
+    # One read snapshot for the whole report
+    conn.execute("BEGIN DEFERRED")
     
-    print("=" * 70)
-    print("  COPILOT CHAT SESSIONS - COMPREHENSIVE ANALYSIS")
-    print("=" * 70)
+    out.append("=" * 70)
+    out.append("  COPILOT CHAT SESSIONS - COMPREHENSIVE ANALYSIS")
+    out.append("=" * 70)
     
     # Overall stats
-    cursor.execute("""
+    # Ratios are derived in SQL from the aggregates of the inner scan.
+    # Only this single row uses sqlite3.Row; the rest are plain tuples.
+    stats_cursor = conn.cursor()
+    stats_cursor.row_factory = sqlite3.Row
+    stats_cursor.execute("""
+        SELECT *,
+            100.0 * with_messages / NULLIF(total, 0) as pct_with_messages,
+            100.0 * empty / NULLIF(total, 0) as pct_empty,
+            100.0 * conversations / NULLIF(total, 0) as pct_conversations,
+            100.0 * code_edits / NULLIF(total, 0) as pct_code_edits,
+            100.0 * mixed / NULLIF(total, 0) as pct_mixed,
+            total_size / 1048576.0 as total_size_mb,
+            1.0 * total_lines / MAX(code_edits + mixed, 1) as avg_lines_per_edit
+        FROM (
         SELECT 
             COUNT(*) as total,
-            COUNT(CASE WHEN message_count = 0 THEN 1 END) as empty,
-            COUNT(CASE WHEN message_count > 0 THEN 1 END) as with_messages,
+            COUNT(*) FILTER (WHERE message_count = 0) as empty,
+            COUNT(*) FILTER (WHERE message_count > 0) as with_messages,
             SUM(message_count) as total_messages,
             SUM(file_size) as total_size,
-            MIN(datetime(creation_date)) as oldest,
-            MAX(datetime(last_message_date)) as newest,
-            COUNT(CASE WHEN session_type = 'conversation' THEN 1 END) as conversations,
-            COUNT(CASE WHEN session_type = 'code_edit' THEN 1 END) as code_edits,
-            COUNT(CASE WHEN session_type = 'mixed' THEN 1 END) as mixed,
-            SUM(CASE WHEN session_type IN ('code_edit', 'mixed') THEN COALESCE(edit_line_count, 0) ELSE 0 END) as total_lines,
-            SUM(CASE WHEN session_type IN ('code_edit', 'mixed') THEN COALESCE(edit_files_count, 0) ELSE 0 END) as total_files_edited
+            datetime(MIN(creation_date)) as oldest,
+            datetime(MAX(last_message_date)) as newest,
+            COUNT(*) FILTER (WHERE session_type = 'conversation') as conversations,
+            COUNT(*) FILTER (WHERE session_type = 'code_edit') as code_edits,
+            COUNT(*) FILTER (WHERE session_type = 'mixed') as mixed,
+            COALESCE(SUM(edit_line_count) FILTER (WHERE session_type IN ('code_edit', 'mixed')), 0) as total_lines,
+            COALESCE(SUM(edit_files_count) FILTER (WHERE session_type IN ('code_edit', 'mixed')), 0) as total_files_edited
         FROM chat_sessions
+        )
     """)
-    stats = dict(cursor.fetchone())
+    stats = dict(stats_cursor.fetchone())
     
-    print(f"\n📊 OVERALL STATISTICS")
-    print(f"   Total Sessions: {stats['total']:,}")
-    print(f"   With Messages: {stats['with_messages']:,} ({stats['with_messages']/stats['total']*100:.1f}%)")
-    print(f"   Empty (0 msgs): {stats['empty']:,} ({stats['empty']/stats['total']*100:.1f}%)")
-    print(f"   Total Messages: {stats['total_messages']:,}")
-    print(f"   Total Size: {stats['total_size']/1024/1024:.2f} MB")
-    print(f"   Date Range: {stats['oldest']} to {stats['newest']}")
+    out.append(f"\n📊 OVERALL STATISTICS")
+    out.append(f"   Total Sessions: {stats['total']:,}")
+    
+    # Nothing else to report; skip the remaining scans
+    if stats['total'] == 0:
+        out.append(f"   (empty database - run sync-chat-contents.py first)")
+        out.append(f"\n{'=' * 70}")
+        _finish(conn, out)
+        return
+    
+    out.append(f"   With Messages: {stats['with_messages']:,} ({stats['pct_with_messages']:.1f}%)")
+    out.append(f"   Empty (0 msgs): {stats['empty']:,} ({stats['pct_empty']:.1f}%)")
+    out.append(f"   Total Messages: {stats['total_messages']:,}")
+    out.append(f"   Total Size: {stats['total_size_mb']:.2f} MB")
+    out.append(f"   Date Range: {stats['oldest']} to {stats['newest']}")
     
     # Session type breakdown
-    print(f"\n💬 SESSION TYPES")
+    out.append(f"\n💬 SESSION TYPES")
     if stats['conversations'] or stats['code_edits'] or stats['mixed']:
-        print(f"   Conversations: {stats['conversations']:,} ({stats['conversations']/stats['total']*100:.1f}%)")
-        print(f"   Code Edits: {stats['code_edits']:,} ({stats['code_edits']/stats['total']*100:.1f}%)")
+        out.append(f"   Conversations: {stats['conversations']:,} ({stats['pct_conversations']:.1f}%)")
+        out.append(f"   Code Edits: {stats['code_edits']:,} ({stats['pct_code_edits']:.1f}%)")
         if stats['mixed'] > 0:
-            print(f"   Mixed: {stats['mixed']:,} ({stats['mixed']/stats['total']*100:.1f}%)")
+            out.append(f"   Mixed: {stats['mixed']:,} ({stats['pct_mixed']:.1f}%)")
         
         if stats['total_lines'] > 0:
-            print(f"\n✏️  CODE EDIT STATISTICS")
-            print(f"   Total Lines Edited: {stats['total_lines']:,}")
-            print(f"   Total Files Edited: {stats['total_files_edited']:,}")
-            avg_lines = stats['total_lines'] / max(stats['code_edits'] + stats['mixed'], 1)
-            print(f"   Avg Lines/Edit Session: {avg_lines:.1f}")
+            out.append(f"\n✏️  CODE EDIT STATISTICS")
+            out.append(f"   Total Lines Edited: {stats['total_lines']:,}")
+            out.append(f"   Total Files Edited: {stats['total_files_edited']:,}")
+            out.append(f"   Avg Lines/Edit Session: {stats['avg_lines_per_edit']:.1f}")
     else:
-        print(f"   (Session types not yet classified - run sync-with-edit-detection.py)")
+        out.append(f"   (Session types not yet classified - run sync-with-edit-detection.py)")
     
     # Empty sessions by workspace
-    print(f"\n⚠️  EMPTY SESSIONS BY WORKSPACE")
+    out.append(f"\n⚠️  EMPTY SESSIONS BY WORKSPACE")
     cursor.execute("""
-        SELECT workspace_name, COUNT(*) as count, GROUP_CONCAT(session_id, ', ') as session_ids
+        SELECT workspace_name, COUNT(*) as count
         FROM chat_sessions 
         WHERE message_count = 0
         GROUP BY workspace_name
         ORDER BY count DESC
         LIMIT 15
     """)
-    print(f"{'Workspace':<35} {'Empty Sessions':<15}")
-    print("-" * 70)
-    for row in cursor:
-        print(f"{row['workspace_name']:<35} {row['count']:<15}")
+    out.append(f"{'Workspace':<35} {'Empty Sessions':<15}")
+    out.append("-" * 70)
+    while batch := cursor.fetchmany():
+        for workspace_name, count in batch:
+            out.append(f"{workspace_name:<35} {count:<15}")
     
     # Active workspaces
-    print(f"\n✅ TOP WORKSPACES BY ACTIVITY")
+    out.append(f"\n✅ TOP WORKSPACES BY ACTIVITY")
+    # Rows come back pre-formatted; '!' pads by characters, not bytes
     cursor.execute("""
-        SELECT 
+        SELECT printf('%!-35s %-12d %-12d %!-20s',
             workspace_name,
-            COUNT(*) as sessions,
-            SUM(message_count) as messages,
-            MAX(datetime(last_message_date)) as last_active
+            COUNT(*),
+            SUM(message_count),
+            datetime(MAX(last_message_date))
+        )
         FROM chat_sessions
         WHERE message_count > 0
         GROUP BY workspace_name
-        ORDER BY messages DESC
+        ORDER BY SUM(message_count) DESC
         LIMIT 15
     """)
-    print(f"{'Workspace':<35} {'Sessions':<12} {'Messages':<12} {'Last Active':<20}")
-    print("-" * 70)
-    for row in cursor:
-        print(f"{row['workspace_name']:<35} {row['sessions']:<12} {row['messages']:<12} {row['last_active']:<20}")
+    out.append(f"{'Workspace':<35} {'Sessions':<12} {'Messages':<12} {'Last Active':<20}")
+    out.append("-" * 70)
+    while batch := cursor.fetchmany():
+        out.extend(row[0] for row in batch)
     
     # Top edited files
-    print(f"\n📝 TOP EDITED FILES (from code edit sessions)")
+    out.append(f"\n📝 TOP EDITED FILES (from code edit sessions)")
     cursor.execute("""
         SELECT edit_file_paths, COUNT(*) as edit_count
         FROM chat_sessions
@@ -108,39 +231,34 @@ def analyze_sessions(db_path="copilot_backup.db"):
         LIMIT 10
     """)
     files_found = False
-    for row in cursor:
-        if not files_found:
-            print(f"{'File Path':<70} {'Edits':<10}")
-            print("-" * 70)
-            files_found = True
-        file_list = row['edit_file_paths'][:67] + "..." if len(row['edit_file_paths']) > 70 else row['edit_file_paths']
-        print(f"{file_list:<70} {row['edit_count']:<10}")
+    while batch := cursor.fetchmany():
+        for edit_file_paths, edit_count in batch:
+            if not files_found:
+                out.append(f"{'File Path':<70} {'Edits':<10}")
+                out.append("-" * 70)
+                files_found = True
+            file_list = edit_file_paths[:67] + "..." if len(edit_file_paths) > 70 else edit_file_paths
+            out.append(f"{file_list:<70} {edit_count:<10}")
     if not files_found:
-        print("   (No code edit data available yet)")
+        out.append("   (No code edit data available yet)")
     
     # Message distribution
-    print(f"\n📈 MESSAGE COUNT DISTRIBUTION")
+    out.append(f"\n📈 MESSAGE COUNT DISTRIBUTION")
     cursor.execute("""
-        SELECT 
-            CASE 
-                WHEN message_count = 0 THEN '0 (empty)'
-                WHEN message_count BETWEEN 1 AND 5 THEN '1-5'
-                WHEN message_count BETWEEN 6 AND 10 THEN '6-10'
-                WHEN message_count BETWEEN 11 AND 20 THEN '11-20'
-                WHEN message_count BETWEEN 21 AND 50 THEN '21-50'
-                ELSE '50+'
-            END as range,
-            COUNT(*) as count
+        SELECT msg_bucket, COUNT(*) as count
         FROM chat_sessions
-        GROUP BY range
-        ORDER BY MIN(message_count)
+        GROUP BY msg_bucket
     """)
-    for row in cursor:
-        bar = '█' * int(row['count'] / stats['total'] * 50)
-        print(f"   {row['range']:<12} {row['count']:>4} {bar}")
+    bucket_counts = dict(cursor.fetchmany())
+    for label in MESSAGE_BUCKETS:
+        count = bucket_counts.get(label)
+        if not count:
+            continue
+        bar = _BAR[:int(count / stats['total'] * BAR_WIDTH)]
+        out.append(f"   {label:<12} {count:>4} {bar}")
     
     # Sync history
-    print(f"\n📅 SYNC HISTORY (Last 5 runs)")
+    out.append(f"\n📅 SYNC HISTORY (Last 5 runs)")
     cursor.execute("""
         SELECT 
             datetime(started_at) as sync_time,
@@ -153,13 +271,13 @@ def analyze_sessions(db_path="copilot_backup.db"):
         ORDER BY id DESC
         LIMIT 5
     """)
-    print(f"{'Sync Time':<20} {'Total':<8} {'New':<6} {'Updated':<9} {'Skipped':<9} {'Errors':<7}")
-    print("-" * 70)
-    for row in cursor:
-        print(f"{row['sync_time']:<20} {row['total_sessions']:<8} {row['inserted_sessions']:<6} {row['updated_sessions']:<9} {row['skipped_sessions']:<9} {row['errors']:<7}")
+    out.append(f"{'Sync Time':<20} {'Total':<8} {'New':<6} {'Updated':<9} {'Skipped':<9} {'Errors':<7}")
+    out.append("-" * 70)
+    for sync_time, total, inserted, updated, skipped, errors in cursor.fetchmany():
+        out.append(f"{sync_time:<20} {total:<8} {inserted:<6} {updated:<9} {skipped:<9} {errors:<7}")
     
     # Sample empty sessions
-    print(f"\n🔍 SAMPLE EMPTY SESSIONS (checking file sizes)")
+    out.append(f"\n🔍 SAMPLE EMPTY SESSIONS (checking file sizes)")
     cursor.execute("""
         SELECT session_id, workspace_name, file_size, file_path
         FROM chat_sessions
@@ -167,38 +285,39 @@ def analyze_sessions(db_path="copilot_backup.db"):
         ORDER BY file_size DESC
         LIMIT 10
     """)
-    print(f"{'Session ID':<38} {'Workspace':<25} {'Size':<10}")
-    print("-" * 70)
-    for row in cursor:
-        print(f"{row['session_id']:<38} {row['workspace_name']:<25} {row['file_size']:>6} bytes")
+    out.append(f"{'Session ID':<38} {'Workspace':<25} {'Size':<10}")
+    out.append("-" * 70)
+    samples = cursor.fetchmany()
+    # Check the files concurrently; each check is dominated by stat/open latency
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        checks = list(executor.map(_load_requests_count, [row[3] for row in samples]))
+    for (session_id, workspace_name, file_size, _), (exists, result) in zip(samples, checks):
+        out.append(f"{session_id:<38} {workspace_name:<25} {file_size:>6} bytes")
         # Check if file actually exists and has content
-        file_path = Path(row['file_path'])
-        if file_path.exists():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = json.load(f)
-                    requests = content.get('requests', [])
-                    print(f"   ↳ File has {len(requests)} requests but 0 extracted messages")
-            except Exception as e:
-                print(f"   ↳ Error reading file: {e}")
+        if not exists:
+            continue
+        if isinstance(result, Exception):
+            out.append(f"   ↳ Error reading file: {result}")
+        else:
+            out.append(f"   ↳ File has {result} requests but 0 extracted messages")
     
     # Recommendations
-    print(f"\n💡 RECOMMENDATIONS")
+    out.append(f"\n💡 RECOMMENDATIONS")
     if stats['empty'] > 0:
-        print(f"   • {stats['empty']} sessions have 0 messages")
-        print(f"     These may be:")
-        print(f"       - Sessions created but never used")
-        print(f"       - Files with parsing errors")
-        print(f"       - Sessions with only system messages (no user/assistant exchanges)")
-        print(f"     Run: python3 sync-chat-contents.py --retry-empty --verbose")
-        print(f"          to attempt re-parsing these sessions")
+        out.append(f"   • {stats['empty']} sessions have 0 messages")
+        out.append(f"     These may be:")
+        out.append(f"       - Sessions created but never used")
+        out.append(f"       - Files with parsing errors")
+        out.append(f"       - Sessions with only system messages (no user/assistant exchanges)")
+        out.append(f"     Run: python3 sync-chat-contents.py --retry-empty --verbose")
+        out.append(f"          to attempt re-parsing these sessions")
     
-    if stats['with_messages'] / stats['total'] > 0.9:
-        print(f"   ✓ Excellent extraction rate: {stats['with_messages']/stats['total']*100:.1f}% of sessions have messages")
+    if stats['pct_with_messages'] > 90:
+        out.append(f"   ✓ Excellent extraction rate: {stats['pct_with_messages']:.1f}% of sessions have messages")
     
-    print(f"\n{'=' * 70}")
+    out.append(f"\n{'=' * 70}")
     
-    conn.close()
+    _finish(conn, out)
 
 
 if __name__ == "__main__":
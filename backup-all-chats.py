@@ -20,8 +20,11 @@ Usage:
     python backup-all-chats.py --incremental       # Only new/changed
     python backup-all-chats.py --schedule hourly   # Mark as hourly backup
     python backup-all-chats.py --list              # List all workspaces
+    python backup-all-chats.py --emit-jsonl        # Also write qa_pairs/sessions JSONL
 """
 
+import os
+import gzip
 import json
 import shutil
 import hashlib
@@ -29,11 +32,40 @@ import sqlite3
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache
 from dataclasses import dataclass, field
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import re
 import urllib.parse
+import threading
+from contextlib import contextmanager
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    _new_hasher = xxhash.xxh3_64
+except ImportError:
+    def _new_hasher():
+        return hashlib.blake2b(digest_size=8)
 
 # ============================================================================
 # Configuration
@@ -76,6 +108,59 @@ PROJECT_PATTERNS = {
     "aiconnects-legacy": ["aiconnects/", "aiconnects.code-workspace"],
 }
 
+# All patterns in priority order, matched in one pass: each alternative is a
+# lookahead that scans the whole path, so the first *listed* pattern present
+# wins (not the leftmost one), and m.lastindex identifies it.
+_PATTERN_LIST = [(pattern, category)
+                 for category, patterns in PROJECT_PATTERNS.items()
+                 for pattern in patterns]
+_PATTERN_RE = re.compile(
+    "|".join(f"(?=.*({re.escape(pattern)}))" for pattern, _ in _PATTERN_LIST),
+    re.IGNORECASE | re.DOTALL
+)
+
+
+@lru_cache(maxsize=4096)
+def _categorize(path: str) -> Tuple[str, str]:
+    """Categorize a workspace path into (project name, category) (memoized; paths recur)."""
+    # Decode URL encoding
+    path_decoded = urllib.parse.unquote(path) if '%' in path else path
+    
+    # Match raw and decoded forms together (patterns never contain a newline)
+    haystack = path if path_decoded == path else f"{path}\n{path_decoded}"
+    m = _PATTERN_RE.match(haystack)
+    if m:
+        pattern, category = _PATTERN_LIST[m.lastindex - 1]
+        # Extract specific project name: usually just the last path component
+        path_clean = path_decoded.replace('file://', '').rstrip('/')
+        tail = path_clean.rpartition('/')[2]
+        if tail and not tail.endswith('.code-workspace'):
+            return tail, category
+        for part in reversed(path_clean.split('/')):
+            if part and not part.endswith('.code-workspace'):
+                return part, category
+        return pattern, category
+    
+    # Default: use folder/file name
+    path_clean = path_decoded.replace('file://', '')
+    name = Path(path_clean).stem if path_clean else 'unknown'
+    return name, 'other'
+
+
+# Read buffer for hashing chat files
+HASH_CHUNK_SIZE = 1 << 20
+# Threads for I/O-bound workspace scanning and chat file parsing
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Session files at least this large are stream-parsed with ijson
+STREAM_PARSE_MIN_BYTES = 16 << 20
+
+# Top-level session fields read by _parse_session
+SESSION_SCALAR_KEYS = {'sessionId', 'creationDate', 'lastMessageDate',
+                       'requesterUsername', 'responderUsername'}
+JSON_SCALAR_EVENTS = {'string', 'number', 'boolean', 'null'}
+# Below this many sessions, process start-up costs more than it saves
+MARKDOWN_PARALLEL_MIN = 256
+
 
 @dataclass
 class WorkspaceInfo:
@@ -86,7 +171,7 @@ class WorkspaceInfo:
     project_name: str
     project_category: str
     chat_sessions_dir: Path
-    chat_files: List[Path] = field(default_factory=list)
+    chat_files: List[os.DirEntry] = field(default_factory=list)  # entries cache their stat
     total_size: int = 0
     last_modified: Optional[datetime] = None
 
@@ -106,6 +191,62 @@ class BackupStats:
     projects: Dict[str, int] = field(default_factory=dict)
 
 
+def _write_session_md(session: Dict, markdown_root: Path):
+    """Write one session's markdown file (top-level so process pools can pickle it)."""
+    project_dir = markdown_root / session['project_category'] / session['project_name']
+    project_dir.mkdir(parents=True, exist_ok=True)
+    
+    date = session.get('last_message_date', '')[:10] or 'unknown'
+    filename = f"{date}_{session['session_id'][:8]}.md"
+    filepath = project_dir / filename
+    
+    # Build the whole document, then write it in one call
+    parts = [
+        f"# Copilot Chat - {session['project_name']}\n\n"
+        f"**Session ID:** `{session['session_id']}`\n"
+        f"**Created:** {session.get('creation_date', 'N/A')}\n"
+        f"**Last Message:** {session.get('last_message_date', 'N/A')}\n"
+        f"**Messages:** {session['message_count']}\n\n"
+        "---\n\n"
+    ]
+    for msg in session.get('messages', []):
+        icon = "👤 **User**" if msg['role'] == 'user' else "🤖 **Copilot**"
+        parts.append(f"## {icon}\n\n{msg['content']}\n\n---\n\n")
+    
+    filepath.write_bytes("".join(parts).encode('utf-8'))
+
+
+def _read_file(path: str, size_hint: int) -> bytes:
+    """Read a whole file with just open/read/close, sized from a stat we already have."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # Ask for one extra byte: a short read means EOF without another read() call
+        data = os.read(fd, size_hint + 1)
+        if len(data) <= size_hint:
+            return data
+        # File grew since it was stat'ed
+        chunks = [data]
+        while chunk := os.read(fd, HASH_CHUNK_SIZE):
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _hash_bytes(data: bytes) -> str:
+    """Hash an in-memory file body the same way _get_file_hash hashes a file."""
+    hasher = _new_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _write_atomic(path: Path, payload: bytes):
+    """Write payload to a temp file and rename it over path, so readers never see a partial file."""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+
 class CopilotBackupSystem:
     """Comprehensive Copilot chat backup system."""
     
@@ -126,18 +267,30 @@ class CopilotBackupSystem:
         }
         for d in self.dirs.values():
             d.mkdir(parents=True, exist_ok=True)
+        # Raw backup dirs already created this run (many files share one)
+        self._raw_dirs = set()
         
-        # Database for tracking
+        # Database for tracking (one connection for the lifetime of the instance)
         self.db_path = self.backup_root / 'backup_tracking.db'
+        self._db_lock = threading.Lock()
+        self.conn = self._connect()
         self._init_database()
         
         # Discover all workspaces
         self.workspaces = self._discover_all_workspaces()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the tracking database with write-friendly pragmas."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+    
     def _init_database(self):
         """Initialize SQLite database for tracking backups."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cursor.executescript('''
             CREATE TABLE IF NOT EXISTS sessions (
@@ -171,34 +324,64 @@ class CopilotBackupSystem:
                 topics TEXT
             );
             
+            CREATE TABLE IF NOT EXISTS qa (
+                session_id TEXT,
+                project TEXT,
+                date TEXT,
+                question TEXT,
+                answer TEXT
+            );
+            
             CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_name);
             CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(last_updated);
+            CREATE INDEX IF NOT EXISTS idx_sessions_workspace ON sessions(workspace_id, last_updated);
+            CREATE INDEX IF NOT EXISTS idx_qa_session ON qa(session_id);
         ''')
         
-        conn.commit()
-        conn.close()
+        # Full-text index over Q&A pairs (external content, kept in sync by triggers)
+        try:
+            cursor.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS qa_fts USING fts5(question, answer, content='qa');
+                
+                CREATE TRIGGER IF NOT EXISTS qa_ai AFTER INSERT ON qa BEGIN
+                    INSERT INTO qa_fts(rowid, question, answer)
+                    VALUES (new.rowid, new.question, new.answer);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS qa_ad AFTER DELETE ON qa BEGIN
+                    INSERT INTO qa_fts(qa_fts, rowid, question, answer)
+                    VALUES ('delete', old.rowid, old.question, old.answer);
+                END;
+            ''')
+        except sqlite3.OperationalError:
+            pass  # SQLite built without FTS5; the plain qa table still works
+        
+        # Older databases predate the stat columns used for change detection
+        cursor.execute("PRAGMA table_info(sessions)")
+        existing = {row[1] for row in cursor.fetchall()}
+        if 'mtime_ns' not in existing:
+            cursor.execute("ALTER TABLE sessions ADD COLUMN mtime_ns INTEGER")
+    
+    @contextmanager
+    def _transaction(self):
+        """Hold the connection for one BEGIN IMMEDIATE ... COMMIT block."""
+        with self._db_lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn.cursor()
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+    
+    def close(self):
+        """Close the tracking database connection."""
+        with self._db_lock:
+            self.conn.close()
     
     def _categorize_project(self, path: str) -> tuple:
         """Categorize a workspace path into project name and category."""
-        path_lower = path.lower()
-        
-        # Decode URL encoding
-        path_decoded = urllib.parse.unquote(path)
-        
-        for category, patterns in PROJECT_PATTERNS.items():
-            for pattern in patterns:
-                if pattern.lower() in path_lower or pattern.lower() in path_decoded.lower():
-                    # Extract specific project name
-                    parts = path_decoded.replace('file://', '').split('/')
-                    for part in reversed(parts):
-                        if part and not part.endswith('.code-workspace'):
-                            return part, category
-                    return pattern, category
-        
-        # Default: use folder/file name
-        path_clean = path_decoded.replace('file://', '')
-        name = Path(path_clean).stem if path_clean else 'unknown'
-        return name, 'other'
+        return _categorize(path)
     
     def _discover_all_workspaces(self) -> Dict[str, WorkspaceInfo]:
         """Discover all VS Code workspaces with chat sessions."""
@@ -208,81 +391,175 @@ class CopilotBackupSystem:
             print(f"⚠️ VS Code storage not found: {VSCODE_STORAGE_PATH}")
             return workspaces
         
-        for ws_dir in VSCODE_STORAGE_PATH.iterdir():
-            if not ws_dir.is_dir():
-                continue
-            
-            workspace_json = ws_dir / "workspace.json"
-            chat_sessions_dir = ws_dir / "chatSessions"
-            
-            if not chat_sessions_dir.exists():
-                continue
-            
-            chat_files = list(chat_sessions_dir.glob("*.json"))
-            if not chat_files:
-                continue
-            
-            # Parse workspace info
-            ws_path = ""
-            ws_type = "folder"
-            
-            if workspace_json.exists():
-                try:
-                    with open(workspace_json, 'r') as f:
-                        data = json.load(f)
-                    ws_path = data.get('folder') or data.get('workspace', '')
-                    ws_type = 'workspace' if 'workspace' in data else 'folder'
-                    
-                    # Check for remote
-                    if 'vscode-remote' in ws_path or 'codespaces' in ws_path:
-                        ws_type = 'remote'
-                except Exception:
-                    pass
-            
-            project_name, project_category = self._categorize_project(ws_path)
-            
-            # Calculate stats
-            total_size = sum(f.stat().st_size for f in chat_files)
-            latest_mod = max(f.stat().st_mtime for f in chat_files) if chat_files else 0
-            
-            workspaces[ws_dir.name] = WorkspaceInfo(
-                workspace_id=ws_dir.name,
-                workspace_path=ws_path,
-                workspace_type=ws_type,
-                project_name=project_name,
-                project_category=project_category,
-                chat_sessions_dir=chat_sessions_dir,
-                chat_files=chat_files,
-                total_size=total_size,
-                last_modified=datetime.fromtimestamp(latest_mod) if latest_mod else None,
-            )
+        # scandir entries know their type from the directory listing (no stat per dir)
+        with os.scandir(VSCODE_STORAGE_PATH) as it:
+            ws_entries = [entry for entry in it if entry.is_dir()]
+        
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            for ws_info in pool.map(self._scan_workspace, ws_entries):
+                if ws_info:
+                    workspaces[ws_info.workspace_id] = ws_info
         
         return workspaces
     
-    def _get_file_hash(self, filepath: Path) -> str:
-        """Calculate MD5 hash of a file."""
-        return hashlib.md5(filepath.read_bytes()).hexdigest()
+    def _scan_workspace(self, ws_entry: os.DirEntry) -> Optional[WorkspaceInfo]:
+        """Collect chat files and metadata for one workspace storage dir."""
+        ws_dir = Path(ws_entry.path)
+        workspace_json = ws_dir / "workspace.json"
+        chat_sessions_dir = ws_dir / "chatSessions"
+        
+        # List directly instead of checking exists() first; each DirEntry
+        # caches its stat, reused by the size/mtime checks during backup
+        try:
+            with os.scandir(chat_sessions_dir) as it:
+                chat_files = [entry for entry in it
+                              if entry.name.endswith('.json') and entry.is_file()]
+        except OSError:
+            return None
+        if not chat_files:
+            return None
+        
+        # Parse workspace info
+        ws_path = ""
+        ws_type = "folder"
+        
+        try:
+            data = _json_loads(workspace_json.read_bytes())
+            ws_path = data.get('folder') or data.get('workspace', '')
+            ws_type = 'workspace' if 'workspace' in data else 'folder'
+            
+            # Check for remote
+            if 'vscode-remote' in ws_path or 'codespaces' in ws_path:
+                ws_type = 'remote'
+        except Exception:
+            pass  # missing or unreadable workspace.json
+        
+        project_name, project_category = self._categorize_project(ws_path)
+        
+        # Calculate stats
+        total_size = 0
+        latest_mod = 0
+        for entry in chat_files:
+            st = entry.stat()
+            total_size += st.st_size
+            if st.st_mtime > latest_mod:
+                latest_mod = st.st_mtime
+        
+        return WorkspaceInfo(
+            workspace_id=ws_entry.name,
+            workspace_path=ws_path,
+            workspace_type=ws_type,
+            project_name=project_name,
+            project_category=project_category,
+            chat_sessions_dir=chat_sessions_dir,
+            chat_files=chat_files,
+            total_size=total_size,
+            last_modified=datetime.fromtimestamp(latest_mod) if latest_mod else None,
+        )
+    
+    def _get_file_hash(self, filepath: str) -> str:
+        """Calculate a fast content hash of a file (xxh3 if available)."""
+        hasher = _new_hasher()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        with open(filepath, 'rb', buffering=0) as f:
+            while n := f.readinto(buf):
+                hasher.update(view[:n])
+        return hasher.hexdigest()
+    
+    def _process_chat_file(self, chat_file: os.DirEntry, ws_info: WorkspaceInfo,
+                           existing: Optional[tuple], incremental: bool) -> tuple:
+        """Hash, parse and raw-backup one chat file (runs on a worker thread).
+        
+        Returns (stat, file_hash, session, touched); session is None when the
+        file is skipped, touched is True for an unchanged file with a new mtime.
+        """
+        st = chat_file.stat()
+        
+        # Unchanged size and mtime: reuse the stored hash without reading the file
+        # (incremental runs never submit such files)
+        raw = None
+        if existing and existing[1:] == (st.st_size, st.st_mtime_ns):
+            file_hash = existing[0]
+        else:
+            if IJSON_AVAILABLE and st.st_size >= STREAM_PARSE_MIN_BYTES:
+                file_hash = self._get_file_hash(chat_file.path)
+            else:
+                # Read once; the same bytes are hashed and then parsed
+                raw = _read_file(chat_file.path, st.st_size)
+                file_hash = _hash_bytes(raw)
+            # Check if already backed up (for incremental)
+            if incremental and existing and existing[0] == file_hash:
+                return st, file_hash, None, True  # Skip unchanged
+        
+        # Parse session
+        session = self._parse_session(chat_file.path, st.st_size, raw)
+        if session:
+            # Backup raw file
+            self._backup_raw_file(chat_file.path, ws_info.project_name, ws_info.project_category, st)
+        return st, file_hash, session, False
     
-    def _parse_session(self, filepath: Path) -> Dict[str, Any]:
-        """Parse a chat session file."""
+    def _load_session_streaming(self, filepath: str) -> Dict[str, Any]:
+        """Stream a large session file, keeping only the fields _parse_session reads."""
+        data = {'requests': []}
+        req = None
+        
+        with open(filepath, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == 'requests.item':
+                    if event == 'start_map':
+                        req = {}
+                    elif event == 'end_map':
+                        data['requests'].append(req)
+                elif event not in JSON_SCALAR_EVENTS:
+                    continue
+                elif prefix in SESSION_SCALAR_KEYS:
+                    data[prefix] = value
+                elif prefix == 'requests.item.message':
+                    req['message'] = value
+                elif prefix == 'requests.item.message.text':
+                    req['message'] = {'text': value}
+                elif prefix == 'requests.item.response.value':
+                    req.setdefault('response', {})['value'] = value
+                elif prefix == 'requests.item.response.result.value':
+                    req.setdefault('response', {})['result'] = {'value': value}
+        
+        return data
+    
+    def _parse_session(self, filepath: str, file_size: Optional[int] = None,
+                       raw: Optional[bytes] = None) -> Dict[str, Any]:
+        """Parse a chat session file (or its already-read bytes)."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if raw is not None:
+                data = _json_loads(raw)
+            else:
+                if file_size is None:
+                    file_size = os.stat(filepath).st_size
+                if IJSON_AVAILABLE and file_size >= STREAM_PARSE_MIN_BYTES:
+                    # Avoid holding the whole document for very large sessions
+                    data = self._load_session_streaming(filepath)
+                else:
+                    data = _json_loads(_read_file(filepath, file_size))
             
             messages = []
-            for req in data.get('requests', []):
+            append = messages.append
+            # Parsed JSON only yields plain dicts, so exact type checks suffice
+            for req in data.get('requests') or ():
                 # User message
-                user_msg = req.get('message', {})
-                user_text = user_msg.get('text', '') if isinstance(user_msg, dict) else str(user_msg)
+                user_msg = req.get('message')
+                if type(user_msg) is dict:
+                    user_text = user_msg.get('text', '')
+                else:
+                    user_text = str(user_msg) if user_msg else ''
                 if user_text:
-                    messages.append({'role': 'user', 'content': user_text})
+                    append({'role': 'user', 'content': user_text})
                 
                 # Assistant response
-                response = req.get('response', {})
-                if isinstance(response, dict):
-                    resp_text = response.get('value', '') or response.get('result', {}).get('value', '')
+                response = req.get('response')
+                if type(response) is dict:
+                    resp_text = response.get('value') or (response.get('result') or {}).get('value')
                     if resp_text:
-                        messages.append({'role': 'assistant', 'content': resp_text})
+                        append({'role': 'assistant', 'content': resp_text})
             
             # Parse timestamps
             creation = data.get('creationDate', 0)
@@ -293,7 +570,7 @@ class CopilotBackupSystem:
                 last_msg /= 1000
             
             return {
-                'session_id': data.get('sessionId', filepath.stem),
+                'session_id': data.get('sessionId', os.path.splitext(os.path.basename(filepath))[0]),
                 'creation_date': datetime.fromtimestamp(creation).isoformat() if creation else None,
                 'last_message_date': datetime.fromtimestamp(last_msg).isoformat() if last_msg else None,
                 'requester': data.get('requesterUsername', 'user'),
@@ -302,10 +579,11 @@ class CopilotBackupSystem:
                 'message_count': len(messages),
             }
         except Exception as e:
-            print(f"  ⚠️ Error parsing {filepath.name}: {e}")
+            print(f"  ⚠️ Error parsing {os.path.basename(filepath)}: {e}")
             return None
     
-    def backup(self, schedule_type: str = 'manual', incremental: bool = False) -> BackupStats:
+    def backup(self, schedule_type: str = 'manual', incremental: bool = False,
+               emit_jsonl: bool = False) -> BackupStats:
         """Perform backup of all chat sessions."""
         start_time = datetime.now()
         stats = BackupStats(timestamp=start_time, schedule_type=schedule_type)
@@ -315,89 +593,108 @@ class CopilotBackupSystem:
         print(f"   Started: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}\n")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        all_sessions = []
-        
-        for ws_id, ws_info in self.workspaces.items():
-            stats.total_workspaces += 1
-            project_sessions = 0
+        # One transaction for the whole run instead of a sync per row
+        with self._transaction() as cursor:
+            all_sessions = []
+            session_rows = []
+            touched_rows = []
             
-            for chat_file in ws_info.chat_files:
-                file_hash = self._get_file_hash(chat_file)
-                file_size = chat_file.stat().st_size
-                
-                # Check if already backed up (for incremental)
-                if incremental:
-                    cursor.execute(
-                        'SELECT file_hash FROM sessions WHERE session_id = ?',
-                        (chat_file.stem,)
-                    )
-                    existing = cursor.fetchone()
-                    if existing and existing[0] == file_hash:
-                        continue  # Skip unchanged
-                
-                # Parse session
-                session = self._parse_session(chat_file)
-                if not session:
-                    continue
-                
-                session['workspace_id'] = ws_id
-                session['project_name'] = ws_info.project_name
-                session['project_category'] = ws_info.project_category
-                session['file_path'] = str(chat_file)
-                session['file_size'] = file_size
-                
-                all_sessions.append(session)
-                stats.total_sessions += 1
-                stats.total_messages += session['message_count']
-                stats.total_size_bytes += file_size
-                project_sessions += 1
+            # Load every tracked row in one query instead of one lookup per file
+            cursor.execute('SELECT session_id, file_hash, file_size, mtime_ns FROM sessions')
+            known = {row[0]: row[1:] for row in cursor.fetchall()}
+            
+            jobs = []
+            pending = {}
+            for ws_id, ws_info in self.workspaces.items():
+                pending[ws_id] = ws_files = []
+                for chat_file in ws_info.chat_files:
+                    existing = known.get(os.path.splitext(chat_file.name)[0])
+                    if incremental and existing:
+                        st = chat_file.stat()  # cached from the directory scan
+                        if existing[1:] == (st.st_size, st.st_mtime_ns):
+                            continue  # Unchanged: no read, hash or parse
+                    ws_files.append(chat_file)
+                    jobs.append((chat_file, ws_info, existing, incremental))
+            
+            # File I/O and parsing fan out to worker threads
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+                results = pool.map(lambda job: self._process_chat_file(*job), jobs)
                 
-                # Track in database
-                cursor.execute('''
-                    INSERT OR REPLACE INTO sessions 
+                for ws_id, ws_info in self.workspaces.items():
+                    stats.total_workspaces += 1
+                    project_sessions = 0
+                    
+                    for chat_file in pending[ws_id]:
+                        st, file_hash, session, touched = next(results)
+                        if touched:
+                            # Touched but identical; remember the new mtime
+                            touched_rows.append((st.st_mtime_ns, os.path.splitext(chat_file.name)[0]))
+                        if not session:
+                            continue
+                        file_size = st.st_size
+                        
+                        session['workspace_id'] = ws_id
+                        session['project_name'] = ws_info.project_name
+                        session['project_category'] = ws_info.project_category
+                        session['file_path'] = chat_file.path
+                        session['file_size'] = file_size
+                        
+                        all_sessions.append(session)
+                        stats.total_sessions += 1
+                        stats.total_messages += session['message_count']
+                        stats.total_size_bytes += file_size
+                        project_sessions += 1
+                        
+                        # Track in database (written in one batch below)
+                        session_rows.append((
+                            session['session_id'], ws_id, ws_info.project_name, file_hash, file_size,
+                            session['message_count'], start_time.isoformat(),
+                            session['last_message_date'], start_time.isoformat(), st.st_mtime_ns
+                        ))
+                    
+                    if project_sessions > 0:
+                        stats.projects[ws_info.project_name] = stats.projects.get(ws_info.project_name, 0) + project_sessions
+                        print(f"  📁 {ws_info.project_name}: {project_sessions} sessions")
+            
+            if touched_rows:
+                cursor.executemany('UPDATE sessions SET mtime_ns = ? WHERE session_id = ?', touched_rows)
+            
+            if session_rows:
+                # Upsert keeps first_seen for sessions we have tracked before
+                cursor.executemany('''
+                    INSERT INTO sessions 
                     (session_id, workspace_id, project_name, file_hash, file_size, 
-                     message_count, first_seen, last_updated, last_backup)
-                    VALUES (?, ?, ?, ?, ?, ?, 
-                            COALESCE((SELECT first_seen FROM sessions WHERE session_id = ?), ?),
-                            ?, ?)
-                ''', (
-                    session['session_id'], ws_id, ws_info.project_name, file_hash, file_size,
-                    session['message_count'], session['session_id'], start_time.isoformat(),
-                    session['last_message_date'], start_time.isoformat()
-                ))
-                
-                # Backup raw file
-                self._backup_raw_file(chat_file, ws_info.project_name, ws_info.project_category)
+                     message_count, first_seen, last_updated, last_backup, mtime_ns)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(session_id) DO UPDATE SET
+                        workspace_id = excluded.workspace_id,
+                        project_name = excluded.project_name,
+                        file_hash = excluded.file_hash,
+                        file_size = excluded.file_size,
+                        message_count = excluded.message_count,
+                        last_updated = excluded.last_updated,
+                        last_backup = excluded.last_backup,
+                        mtime_ns = excluded.mtime_ns
+                ''', session_rows)
+            
+            # Generate exports
+            if all_sessions:
+                print(f"\n📝 Generating exports...")
+                self._generate_markdown(all_sessions)
+                self._generate_daily_summary(all_sessions, schedule_type)
+                qa_rows = self._generate_ai_export(all_sessions, emit_jsonl)
+                self._store_qa_pairs(cursor, all_sessions, qa_rows)
+                self._generate_master_index(all_sessions, stats)
             
-            if project_sessions > 0:
-                stats.projects[ws_info.project_name] = stats.projects.get(ws_info.project_name, 0) + project_sessions
-                print(f"  📁 {ws_info.project_name}: {project_sessions} sessions")
-        
-        conn.commit()
-        
-        # Generate exports
-        if all_sessions:
-            print(f"\n📝 Generating exports...")
-            self._generate_markdown(all_sessions)
-            self._generate_daily_summary(all_sessions, schedule_type)
-            self._generate_ai_export(all_sessions)
-            self._generate_master_index(all_sessions, stats)
-        
-        # Record backup
-        stats.duration_seconds = (datetime.now() - start_time).total_seconds()
-        cursor.execute('''
-            INSERT INTO backups (timestamp, schedule_type, total_sessions, 
-                                new_sessions, updated_sessions, total_size, duration_seconds)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (start_time.isoformat(), schedule_type, stats.total_sessions,
-              stats.new_sessions, stats.updated_sessions, 
-              stats.total_size_bytes, stats.duration_seconds))
-        
-        conn.commit()
-        conn.close()
+            # Record backup
+            stats.duration_seconds = (datetime.now() - start_time).total_seconds()
+            cursor.execute('''
+                INSERT INTO backups (timestamp, schedule_type, total_sessions, 
+                                    new_sessions, updated_sessions, total_size, duration_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (start_time.isoformat(), schedule_type, stats.total_sessions,
+                  stats.new_sessions, stats.updated_sessions, 
+                  stats.total_size_bytes, stats.duration_seconds))
         
         # Print summary
         print(f"\n{'='*60}")
@@ -411,45 +708,72 @@ class CopilotBackupSystem:
         
         return stats
     
-    def _backup_raw_file(self, filepath: Path, project_name: str, category: str):
+    def _backup_raw_file(self, filepath: str, project_name: str, category: str,
+                         src_stat: Optional[os.stat_result] = None):
         """Backup raw JSON file with organization."""
         # Organize by category/project/date
         date_str = datetime.now().strftime("%Y-%m-%d")
         dest_dir = self.dirs['raw'] / category / project_name / date_str
-        dest_dir.mkdir(parents=True, exist_ok=True)
+        if dest_dir not in self._raw_dirs:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            self._raw_dirs.add(dest_dir)
         
-        dest_file = dest_dir / filepath.name
+        dest_file = dest_dir / os.path.basename(filepath)
         
-        # Only copy if different
-        if dest_file.exists():
-            if self._get_file_hash(dest_file) == self._get_file_hash(filepath):
+        # Only copy if different (copies keep the source mtime, so size+mtime identify them)
+        src_stat = src_stat or os.stat(filepath)
+        try:
+            dest_stat = dest_file.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            if (dest_stat.st_size, dest_stat.st_mtime_ns) == (src_stat.st_size, src_stat.st_mtime_ns):
                 return
         
-        shutil.copy2(filepath, dest_file)
+        self._copy_file(filepath, dest_file, src_stat)
+    
+    def _copy_file(self, src: str, dest: Path, src_stat: os.stat_result):
+        """Copy a file in-kernel with copy_file_range, falling back to shutil.copy2."""
+        if not hasattr(os, 'copy_file_range'):
+            shutil.copy2(src, dest)
+            return
+        
+        try:
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                dest_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                                  src_stat.st_mode & 0o777)
+                try:
+                    # Loop until the size we stat'ed has been copied or EOF
+                    remaining = src_stat.st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_fd, dest_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                finally:
+                    os.close(dest_fd)
+            finally:
+                os.close(src_fd)
+        except OSError:
+            # e.g. EXDEV on older kernels or filesystems without support
+            shutil.copy2(src, dest)
+            return
+        
+        os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
     
     def _generate_markdown(self, sessions: List[Dict]):
         """Generate readable markdown for each session."""
-        for session in sessions:
-            project_dir = self.dirs['markdown'] / session['project_category'] / session['project_name']
-            project_dir.mkdir(parents=True, exist_ok=True)
-            
-            date = session.get('last_message_date', '')[:10] or 'unknown'
-            filename = f"{date}_{session['session_id'][:8]}.md"
-            filepath = project_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Copilot Chat - {session['project_name']}\n\n")
-                f.write(f"**Session ID:** `{session['session_id']}`\n")
-                f.write(f"**Created:** {session.get('creation_date', 'N/A')}\n")
-                f.write(f"**Last Message:** {session.get('last_message_date', 'N/A')}\n")
-                f.write(f"**Messages:** {session['message_count']}\n\n")
-                f.write("---\n\n")
-                
-                for msg in session.get('messages', []):
-                    icon = "👤 **User**" if msg['role'] == 'user' else "🤖 **Copilot**"
-                    f.write(f"## {icon}\n\n")
-                    f.write(f"{msg['content']}\n\n")
-                    f.write("---\n\n")
+        markdown_root = self.dirs['markdown']
+        if len(sessions) < MARKDOWN_PARALLEL_MIN:
+            for session in sessions:
+                _write_session_md(session, markdown_root)
+            return
+        
+        # Formatting is pure-Python CPU work, so fan out across processes
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(_write_session_md, sessions,
+                          [markdown_root] * len(sessions), chunksize=32))
     
     def _generate_daily_summary(self, sessions: List[Dict], schedule_type: str):
         """Generate daily or hourly activity summary."""
@@ -471,29 +795,47 @@ class CopilotBackupSystem:
         
         filepath = target_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"# {title}\n\n")
-            f.write(f"**Generated:** {now.isoformat()}\n")
-            f.write(f"**Total Sessions:** {len(sessions)}\n")
-            f.write(f"**Total Messages:** {sum(s['message_count'] for s in sessions)}\n\n")
+        parts = [
+            f"# {title}\n\n"
+            f"**Generated:** {now.isoformat()}\n"
+            f"**Total Sessions:** {len(sessions)}\n"
+            f"**Total Messages:** {sum(s['message_count'] for s in sessions)}\n\n"
+            "## Projects\n\n"
+        ]
+        for project, proj_sessions in sorted(by_project.items(), key=lambda x: -len(x[1])):
+            msg_count = sum(s['message_count'] for s in proj_sessions)
+            parts.append(
+                f"### {project}\n"
+                f"- Sessions: {len(proj_sessions)}\n"
+                f"- Messages: {msg_count}\n\n"
+            )
             
-            f.write("## Projects\n\n")
-            for project, proj_sessions in sorted(by_project.items(), key=lambda x: -len(x[1])):
-                msg_count = sum(s['message_count'] for s in proj_sessions)
-                f.write(f"### {project}\n")
-                f.write(f"- Sessions: {len(proj_sessions)}\n")
-                f.write(f"- Messages: {msg_count}\n\n")
-                
-                # Show recent topics
-                for s in proj_sessions[:3]:
-                    for msg in s.get('messages', []):
-                        if msg['role'] == 'user':
-                            preview = msg['content'][:150].replace('\n', ' ')
-                            f.write(f"> {preview}...\n\n")
-                            break
+            # Show recent topics
+            for s in proj_sessions[:3]:
+                for msg in s.get('messages', []):
+                    if msg['role'] == 'user':
+                        preview = msg['content'][:150].replace('\n', ' ')
+                        parts.append(f"> {preview}...\n\n")
+                        break
+        
+        filepath.write_bytes("".join(parts).encode('utf-8'))
+    
+    def _store_qa_pairs(self, cursor: sqlite3.Cursor, sessions: List[Dict], qa_rows: List[tuple]):
+        """Replace the stored Q&A pairs of the exported sessions (qa_fts follows via triggers)."""
+        cursor.executemany('DELETE FROM qa WHERE session_id = ?',
+                           [(s['session_id'],) for s in sessions])
+        cursor.executemany(
+            'INSERT INTO qa (session_id, project, date, question, answer) VALUES (?, ?, ?, ?, ?)',
+            qa_rows
+        )
     
-    def _generate_ai_export(self, sessions: List[Dict]):
-        """Generate AI-friendly export formats."""
+    def _generate_ai_export(self, sessions: List[Dict], emit_jsonl: bool = False) -> List[tuple]:
+        """Generate AI-friendly export formats.
+        
+        Returns Q&A rows (session_id, project, date, question, answer) for the
+        qa table; the JSON/JSONL Q&A and session dumps are only written when
+        emit_jsonl is set.
+        """
         timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
         
         # Full export
@@ -504,6 +846,10 @@ class CopilotBackupSystem:
         }
         
         qa_pairs = []
+        qa_rows = []
+        # JSONL lines are serialized in the same pass that builds the export
+        session_lines = []
+        qa_lines = []
         
         for session in sessions:
             session_export = {
@@ -516,40 +862,45 @@ class CopilotBackupSystem:
                 'conversation': session.get('messages', [])
             }
             export_data['sessions'].append(session_export)
+            if emit_jsonl:
+                session_lines.append(_json_dumps(session_export))
             
             # Extract Q&A pairs
             messages = session.get('messages', [])
             for i in range(0, len(messages) - 1, 2):
                 if messages[i]['role'] == 'user' and i + 1 < len(messages):
-                    qa_pairs.append({
+                    qa = {
                         'project': session['project_name'],
                         'date': session.get('last_message_date', '')[:10],
                         'question': messages[i]['content'],
                         'answer': messages[i + 1]['content'],
-                    })
-        
-        # Write full export (latest)
-        with open(self.dirs['ai_export'] / 'latest_export.json', 'w') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
-        
-        # Write timestamped export
-        with open(self.dirs['ai_export'] / f'export_{timestamp}.json', 'w') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
-        
-        # Write Q&A pairs
-        with open(self.dirs['ai_export'] / 'qa_pairs.json', 'w') as f:
-            json.dump(qa_pairs, f, indent=2, ensure_ascii=False)
-        
-        with open(self.dirs['ai_export'] / 'qa_pairs.jsonl', 'w') as f:
-            for qa in qa_pairs:
-                f.write(json.dumps(qa, ensure_ascii=False) + '\n')
-        
-        # Write sessions JSONL
-        with open(self.dirs['ai_export'] / 'sessions.jsonl', 'w') as f:
-            for s in export_data['sessions']:
-                f.write(json.dumps(s, ensure_ascii=False) + '\n')
+                    }
+                    qa_rows.append((session['session_id'], qa['project'], qa['date'],
+                                    qa['question'], qa['answer']))
+                    if emit_jsonl:
+                        qa_pairs.append(qa)
+                        qa_lines.append(_json_dumps(qa))
+        
+        # Write full export (latest); pretty-printed since people read it
+        export_json = _json_dumps(export_data, indent=True)
+        _write_atomic(self.dirs['ai_export'] / 'latest_export.json', export_json)
+        
+        # Write timestamped export, compressed (archive copy, rarely opened)
+        with gzip.open(self.dirs['ai_export'] / f'export_{timestamp}.json.gz', 'wb', compresslevel=1) as f:
+            f.write(export_json)
+        
+        if emit_jsonl:
+            # Write Q&A pairs (compact: consumed by tooling)
+            _write_atomic(self.dirs['ai_export'] / 'qa_pairs.json', _json_dumps(qa_pairs))
+            _write_atomic(self.dirs['ai_export'] / 'qa_pairs.jsonl',
+                          b''.join(line + b'\n' for line in qa_lines))
+            
+            # Write sessions JSONL
+            _write_atomic(self.dirs['ai_export'] / 'sessions.jsonl',
+                          b''.join(line + b'\n' for line in session_lines))
         
-        print(f"   📤 Exported {len(qa_pairs)} Q&A pairs")
+        print(f"   📤 Exported {len(qa_rows)} Q&A pairs")
+        return qa_rows
     
     def _generate_master_index(self, sessions: List[Dict], stats: BackupStats):
         """Generate master index with all metadata."""
@@ -593,8 +944,7 @@ class CopilotBackupSystem:
                 'preview': first_msg,
             })
         
-        with open(self.dirs['index'] / 'master_index.json', 'w') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        _write_atomic(self.dirs['index'] / 'master_index.json', _json_dumps(index, indent=True))
     
     def list_workspaces(self):
         """Print all discovered workspaces."""
@@ -629,15 +979,22 @@ def main():
                         help='List all workspaces and exit')
     parser.add_argument('--backup-path', '-o', type=Path,
                         help='Custom backup destination')
+    parser.add_argument('--emit-jsonl', action='store_true',
+                        help='Also write qa_pairs.json(l) and sessions.jsonl '
+                             '(Q&A pairs are always stored in the qa/qa_fts tables)')
     
     args = parser.parse_args()
     
     backup = CopilotBackupSystem(backup_root=args.backup_path)
     
-    if args.list:
-        backup.list_workspaces()
-    else:
-        backup.backup(schedule_type=args.schedule, incremental=args.incremental)
+    try:
+        if args.list:
+            backup.list_workspaces()
+        else:
+            backup.backup(schedule_type=args.schedule, incremental=args.incremental,
+                          emit_jsonl=args.emit_jsonl)
+    finally:
+        backup.close()
 
 
 if __name__ == "__main__":
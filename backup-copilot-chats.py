@@ -20,15 +20,68 @@ Usage:
 
 import json
 import os
+import sys
 import shutil
 import hashlib
+import mmap
+import pickle
 import argparse
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Iterator, Set, NamedTuple
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import defaultdict, Counter
+from itertools import groupby, chain, islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import re
+import threading
+from urllib.parse import unquote
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from blake3 import blake3 as _new_hasher
+except ImportError:
+    def _new_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
 
 # Configuration
 # Try to find VS Code storage path
@@ -65,8 +118,87 @@ TRACKED_PROJECTS = {
     "aiconnects-workflow": "/mnt/NTFS-Data/GitHub-SSD/aiconnects-workflow",
 }
 
+# Every tracked project's path and name checks fused into one regex, matched
+# against "ws_path NUL ws_path.lower()": paths must occur before the NUL and
+# names after it. Each alternative is a lookahead from the start, so the first
+# *listed* project present wins (not the leftmost one), and m.lastindex
+# identifies it.
+_TRACKED_ALTERNATIVES = [
+    (name, alternative)
+    for name, path in TRACKED_PROJECTS.items()
+    for alternative in (f"[^\x00]*?({re.escape(path)})", f"[^\x00]*\x00.*?({re.escape(name)})")
+]
+_TRACKED_RE = re.compile("|".join(f"(?={alternative})" for _, alternative in _TRACKED_ALTERNATIVES),
+                         re.DOTALL)
 
-@dataclass
+# Near-duplicate detection (--skip-near-duplicates, needs datasketch)
+NEAR_DUP_THRESHOLD = 0.85
+MINHASH_PERMUTATIONS = 128
+SHINGLE_WORDS = 5
+
+# Role codes for the vectorized Q&A pairing scan
+_ROLE_CODES = {'user': 0, 'assistant': 1}
+
+# Markdown fragments repeated for every message
+MD_SEPARATOR = "---\n\n"
+MD_USER_HEADING = "## 👤 User\n\n"
+MD_ASSISTANT_HEADING = "## 🤖 GitHub Copilot\n\n"
+
+# Layout shown in the generated backup README
+BACKUP_TREE = """\
+copilot-chat-backups/
+├── raw/              # Original JSON files by project
+├── markdown/         # Human-readable markdown by project
+├── daily/            # Daily activity summaries
+├── ai-export/        # AI-friendly formats
+│   ├── full_export_manifest.json  # Lists the export shards
+│   ├── full_export_0000.json      # Complete export, 500 sessions per shard
+│   ├── sessions.jsonl      # One session per line
+│   ├── qa_pairs.json       # Question-answer pairs
+│   └── qa_pairs.jsonl      # Q&A pairs (JSONL)
+├── index/            # Search indexes
+│   └── master_index.json
+└── README.md
+"""
+
+README_TEMPLATE = """\
+# Copilot Chat Backup
+
+**Last Backup:** {timestamp}
+
+## Structure
+
+```
+{tree}```
+
+## Statistics
+
+- **Total Sessions:** {total_sessions}
+- **Total Messages:** {total_messages}
+- **Total Size:** {total_size_mb:.2f} MB
+
+## Projects
+
+{projects}"""
+
+# Per-message/session records drop their __dict__ where dataclasses support slots (3.10+)
+_RECORD_OPTIONS = {'frozen': True, 'slots': True} if sys.version_info >= (3, 10) else {'frozen': True}
+
+# Below this many chat files a process pool costs more to start than it saves
+PARSE_PARALLEL_MIN = 8
+# Threads for I/O-bound workspace scanning and markdown writes
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Rendered markdown files allowed to wait for a writer thread at once
+MARKDOWN_WRITES_IN_FLIGHT = 64
+# Sessions per full_export_NNNN.json shard
+EXPORT_SHARD_SIZE = 500
+# Follow-up read size when a chat file grew after it was stat'ed
+READ_CHUNK_SIZE = 1 << 20
+# ioctl from <linux/fs.h> that clones a file's extents (reflink) on btrfs/xfs
+FICLONE = 0x40049409
+
+
+@dataclass(**_RECORD_OPTIONS)
 class ChatMessage:
     """Represents a single message in a chat conversation."""
     role: str  # 'user' or 'assistant'
@@ -75,7 +207,7 @@ class ChatMessage:
     model: Optional[str] = None
     
 
-@dataclass
+@dataclass(**_RECORD_OPTIONS)
 class ChatSession:
     """Represents a complete chat session."""
     session_id: str
@@ -102,6 +234,380 @@ class DailyActivity:
     files_modified: List[str]
     
 
+if MSGSPEC_AVAILABLE:
+    # Typed schema for the fields _parse_chat_session reads. Everything else in a
+    # chat file (variable data, content references, followups...) is skipped by the
+    # decoder without being materialized. message/response stay Raw because their
+    # shape varies; they are decoded on their own below.
+    
+    class _MessageWire(msgspec.Struct):
+        text: Any = ''
+    
+    class _ResponseWire(msgspec.Struct):
+        value: Any = msgspec.UNSET
+        result: Any = msgspec.UNSET
+        message: Any = msgspec.UNSET
+        model: Any = msgspec.UNSET
+    
+    class _RequestWire(msgspec.Struct):
+        message: msgspec.Raw = msgspec.Raw(b'{}')
+        response: msgspec.Raw = msgspec.Raw(b'{}')
+        timestamp: Any = None
+    
+    class _SessionWire(msgspec.Struct):
+        requests: List[_RequestWire] = []
+        creationDate: Any = 0
+        lastMessageDate: Any = msgspec.UNSET
+        sessionId: Any = msgspec.UNSET
+        requesterUsername: Any = 'user'
+        responderUsername: Any = 'GitHub Copilot'
+    
+    _SESSION_DECODER = msgspec.json.Decoder(_SessionWire)
+    _MESSAGE_DECODER = msgspec.json.Decoder(_MessageWire)
+    _RESPONSE_DECODER = msgspec.json.Decoder(_ResponseWire)
+
+
+def _decode_session(raw: bytes) -> Dict[str, Any]:
+    """Decode a chat file into the dict shape _parse_chat_session walks.
+    
+    With msgspec only the fields the parser reads are built; otherwise (or for a
+    shape the schema doesn't model) the whole document is decoded generically.
+    """
+    if not MSGSPEC_AVAILABLE:
+        return _json_loads(raw)
+    try:
+        wire = _SESSION_DECODER.decode(raw)
+    except msgspec.ValidationError:
+        return _json_loads(raw)
+    
+    data = {
+        'creationDate': wire.creationDate,
+        'requesterUsername': wire.requesterUsername,
+        'responderUsername': wire.responderUsername,
+        'requests': [],
+    }
+    if wire.lastMessageDate is not msgspec.UNSET:
+        data['lastMessageDate'] = wire.lastMessageDate
+    if wire.sessionId is not msgspec.UNSET:
+        data['sessionId'] = wire.sessionId
+    
+    append = data['requests'].append
+    for req in wire.requests:
+        if memoryview(req.message)[:1] == b'{':
+            message = {'text': _MESSAGE_DECODER.decode(req.message).text}
+        else:
+            message = msgspec.json.decode(req.message)
+        
+        # Only object responses carry text; others are never decoded
+        response = None
+        if memoryview(req.response)[:1] == b'{':
+            wire_response = _RESPONSE_DECODER.decode(req.response)
+            response = {
+                field: getattr(wire_response, field)
+                for field in _ResponseWire.__struct_fields__
+                if getattr(wire_response, field) is not msgspec.UNSET
+            }
+        
+        append({'message': message, 'response': response, 'timestamp': req.timestamp})
+    
+    return data
+
+
+def _read_file(path: str, size_hint: int) -> bytes:
+    """Read a whole file with just open/read/close, sized from a stat we already have."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # Ask for one extra byte: a short read means EOF without another read() call
+        data = os.read(fd, size_hint + 1)
+        if len(data) <= size_hint:
+            return data
+        # File grew since it was stat'ed
+        chunks = [data]
+        while chunk := os.read(fd, READ_CHUNK_SIZE):
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _file_digest(path: str) -> bytes:
+    """BLAKE3 (or BLAKE2b) digest of a file, hashed straight from an mmap instead of a read copy."""
+    hasher = _new_hasher()
+    with open(path, 'rb') as f:
+        # mmap refuses empty files
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                hasher.update(m)
+    return hasher.digest()
+
+
+def _reflink_or_copy(src: str, dest: Path, src_stat: os.stat_result):
+    """Copy src to dest, sharing extents with a reflink where the filesystem can.
+    
+    Tries a FICLONE reflink, then an in-kernel copy_file_range, then shutil.copy2.
+    """
+    if fcntl is None or not hasattr(os, 'copy_file_range'):
+        shutil.copy2(src, dest)
+        return
+    
+    try:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dest_fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                              src_stat.st_mode & 0o777)
+            try:
+                try:
+                    fcntl.ioctl(dest_fd, FICLONE, src_fd)
+                except OSError:
+                    # Not a copy-on-write filesystem: copy inside the kernel instead
+                    remaining = src_stat.st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_fd, dest_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+            finally:
+                os.close(dest_fd)
+        finally:
+            os.close(src_fd)
+    except OSError:
+        # e.g. EXDEV on older kernels
+        shutil.copy2(src, dest)
+        return
+    
+    os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+
+def _write_json_array(f, items: Iterable[Any], level: int = 0) -> int:
+    """Stream items into f as an indent=2 JSON array nested `level` deep; returns the count.
+    
+    Produces the same bytes as dumping the whole list at once, one item at a time.
+    """
+    pad = b'\n' + b'  ' * (level + 1)
+    count = 0
+    for item in items:
+        # Encoded JSON has no raw newlines inside strings, so re-indenting is safe
+        f.write((b',' if count else b'[') + pad + _json_dumps(item, indent=True).replace(b'\n', pad))
+        count += 1
+    f.write(b'\n' + b'  ' * level + b']' if count else b'[]')
+    return count
+
+
+class RenderedSession(NamedTuple):
+    """Everything derived from one pass over a session's messages."""
+    markdown: bytes
+    export: Dict[str, Any]
+    first_user_message: Optional[str]
+
+
+def _render_session(session: 'ChatSession') -> RenderedSession:
+    """Build a session's markdown file, export entry and preview in one walk of its messages."""
+    parts = [
+        "# Copilot Chat Session\n\n",
+        f"**Project:** {session.workspace_name}\n",
+        f"**Session ID:** {session.session_id}\n",
+        f"**Created:** {session.creation_date.isoformat()}\n",
+        f"**Last Message:** {session.last_message_date.isoformat()}\n",
+        f"**Messages:** {session.message_count}\n",
+        f"**Workspace:** `{session.workspace_path}`\n\n",
+        MD_SEPARATOR,
+    ]
+    ap = parts.append
+    conversation = []
+    first_user_message = None
+    
+    for msg in session.messages:
+        if msg.role == 'user':
+            ap(MD_USER_HEADING)
+            if first_user_message is None:
+                first_user_message = msg.content
+        else:
+            ap(MD_ASSISTANT_HEADING)
+        # Clean and write content
+        ap(msg.content.strip())
+        ap("\n\n")
+        ap(MD_SEPARATOR)
+        conversation.append({'role': msg.role, 'content': msg.content})
+    
+    export = {
+        'id': session.session_id,
+        'project': session.workspace_name,
+        'created': session.creation_date.isoformat(),
+        'last_message': session.last_message_date.isoformat(),
+        'message_count': session.message_count,
+        'conversation': conversation,
+    }
+    return RenderedSession("".join(parts).encode('utf-8'), export, first_user_message)
+
+
+def _find_near_duplicates(sessions: List['ChatSession']) -> Set[int]:
+    """Indexes of sessions whose text is a near-duplicate of an earlier session in the list.
+    
+    Compares MinHash signatures of word shingles through an LSH index, so the first
+    copy seen is kept and each later one costs a single lookup.
+    """
+    lsh = MinHashLSH(threshold=NEAR_DUP_THRESHOLD, num_perm=MINHASH_PERMUTATIONS)
+    near_dups = set()
+    
+    for i, session in enumerate(sessions):
+        words = ' '.join(msg.content for msg in session.messages).split()
+        if not words:
+            continue
+        shingles = {' '.join(words[j:j + SHINGLE_WORDS]).encode('utf-8')
+                    for j in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+        
+        minhash = MinHash(num_perm=MINHASH_PERMUTATIONS)
+        minhash.update_batch(list(shingles))
+        if lsh.query(minhash):
+            near_dups.add(i)
+        else:
+            lsh.insert(str(i), minhash)
+    
+    return near_dups
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _scan_qa_pairs(roles, lengths):
+        """Compiled pairing scan: (session index, message index) arrays of each pair start."""
+        owners = np.empty(roles.size // 2, np.int64)
+        positions = np.empty(roles.size // 2, np.int64)
+        n = 0
+        offset = 0
+        for s in range(lengths.size):
+            for i in range(0, lengths[s] - 1, 2):
+                if roles[offset + i] == 0 and roles[offset + i + 1] == 1:
+                    owners[n] = s
+                    positions[n] = i
+                    n += 1
+            offset += lengths[s]
+        return owners[:n], positions[:n]
+
+
+def _qa_pair_positions(sessions: List['ChatSession']) -> Iterator[Tuple['ChatSession', int]]:
+    """Yield (session, i) for each user message at an even position i answered by message i+1."""
+    if not NUMPY_AVAILABLE:
+        for session in sessions:
+            messages = session.messages
+            for i in range(0, len(messages) - 1, 2):
+                if messages[i].role == 'user' and messages[i + 1].role == 'assistant':
+                    yield session, i
+        return
+    
+    # Flatten every session's roles into one array and scan all adjacencies at once
+    lengths = np.fromiter((len(s.messages) for s in sessions), dtype=np.int64, count=len(sessions))
+    total = int(lengths.sum())
+    if total < 2:
+        return
+    roles = np.fromiter((_ROLE_CODES.get(m.role, 2) for s in sessions for m in s.messages),
+                        dtype=np.uint8, count=total)
+    
+    if NUMBA_AVAILABLE:
+        # One compiled loop instead of the temporary arrays the mask below needs
+        owners, positions = _scan_qa_pairs(roles, lengths)
+        for k, i in zip(owners.tolist(), positions.tolist()):
+            yield sessions[k], i
+        return
+    
+    owner = np.repeat(np.arange(len(sessions)), lengths)
+    local = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    
+    # Pairs never straddle two sessions and start on even positions, as the export always has
+    starts = np.flatnonzero((roles[:-1] == 0) & (roles[1:] == 1)
+                            & (local[:-1] % 2 == 0) & (owner[:-1] == owner[1:]))
+    for k in starts.tolist():
+        yield sessions[owner[k]], int(local[k])
+
+
+def _iter_qa_pairs(sessions: List['ChatSession']) -> Iterator[Dict[str, str]]:
+    """Yield question/answer pairs from adjacent user/assistant messages."""
+    for session, i in _qa_pair_positions(sessions):
+        yield {
+            'project': session.workspace_name,
+            'date': session.last_message_date.isoformat(),
+            'question': session.messages[i].content,
+            'answer': session.messages[i + 1].content,
+        }
+
+
+def _parse_chat_session(task: Tuple[str, int, Dict[str, str]]) -> Optional[Dict[str, Any]]:
+    """Parse a single chat session file (top-level so process pools can pickle it).
+
+    Returns the ChatSession fields as a plain dict; backup_all rebuilds the dataclasses.
+    """
+    file_path, file_size, workspace_info = Path(task[0]), task[1], task[2]
+    try:
+        data = _decode_session(_read_file(task[0], file_size))
+        
+        messages = []
+        requests = data.get('requests', [])
+        
+        for req in requests:
+            # User message
+            user_msg = req.get('message', {})
+            user_text = user_msg.get('text', '') if isinstance(user_msg, dict) else str(user_msg)
+            
+            if user_text:
+                messages.append({
+                    'role': 'user',
+                    'content': user_text,
+                    'timestamp': req.get('timestamp'),
+                })
+            
+            # Assistant response
+            response = req.get('response', {})
+            if isinstance(response, dict):
+                # Extract response text from various formats
+                response_text = ''
+                
+                # Try different response formats
+                if 'value' in response:
+                    response_text = response['value']
+                elif 'result' in response:
+                    result = response['result']
+                    if isinstance(result, dict):
+                        response_text = result.get('value', '') or result.get('message', '')
+                    else:
+                        response_text = str(result)
+                elif 'message' in response:
+                    response_text = response['message']
+                    
+                if response_text:
+                    messages.append({
+                        'role': 'assistant',
+                        'content': response_text,
+                        'model': response.get('model'),
+                    })
+        
+        # Parse timestamps
+        creation_ts = data.get('creationDate', 0)
+        last_msg_ts = data.get('lastMessageDate', creation_ts)
+        
+        # Handle millisecond timestamps
+        if creation_ts > 1e12:
+            creation_ts /= 1000
+        if last_msg_ts > 1e12:
+            last_msg_ts /= 1000
+            
+        return {
+            'session_id': data.get('sessionId', file_path.stem),
+            'workspace_name': workspace_info.get('project_name', 'unknown'),
+            'workspace_path': workspace_info.get('workspace_path', ''),
+            'creation_date': datetime.fromtimestamp(creation_ts) if creation_ts else datetime.now(),
+            'last_message_date': datetime.fromtimestamp(last_msg_ts) if last_msg_ts else datetime.now(),
+            'requester_username': data.get('requesterUsername', 'user'),
+            'responder_username': data.get('responderUsername', 'GitHub Copilot'),
+            'messages': messages,
+            'file_path': str(file_path),
+            'file_size': file_size,
+            'message_count': len(messages),
+        }
+        
+    except Exception as e:
+        print(f"⚠️ Error parsing {file_path.name}: {e}")
+        return None
+
+
 class CopilotChatBackup:
     """Main backup system for GitHub Copilot chat sessions."""
     
@@ -120,8 +626,29 @@ class CopilotChatBackup:
                      self.daily_path, self.ai_export_path, self.index_path]:
             path.mkdir(parents=True, exist_ok=True)
         
+        # Parsed session fields from earlier runs: {file_path: (size, mtime_ns, fields)}
+        self.parse_cache_path = self.index_path / "parse_cache.pkl"
+        self._parse_cache = self._load_parse_cache()
+        
         self.workspace_map = self._discover_workspaces()
         
+    def _load_parse_cache(self) -> Dict[str, Tuple[int, int, Dict[str, Any]]]:
+        """Load the parse cache, starting empty if it is missing or unreadable."""
+        try:
+            cache = pickle.loads(self.parse_cache_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable parse cache: {e}")
+            return {}
+        return cache if isinstance(cache, dict) else {}
+    
+    def _save_parse_cache(self, cache: Dict[str, Tuple[int, int, Dict[str, Any]]]):
+        """Persist the parse cache atomically so an interrupted run can't corrupt it."""
+        tmp_path = self.parse_cache_path.with_suffix('.tmp')
+        tmp_path.write_bytes(pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, self.parse_cache_path)
+        
     def _discover_workspaces(self) -> Dict[str, Dict[str, Any]]:
         """Discover all VS Code workspaces and map them to projects."""
         workspace_map = {}
@@ -130,127 +657,69 @@ class CopilotChatBackup:
             print(f"⚠️ VS Code storage path not found: {VSCODE_STORAGE_PATH}")
             return workspace_map
             
-        for ws_dir in VSCODE_STORAGE_PATH.iterdir():
-            if not ws_dir.is_dir():
-                continue
-                
-            workspace_json = ws_dir / "workspace.json"
-            if not workspace_json.exists():
-                continue
-                
-            try:
-                with open(workspace_json, 'r') as f:
-                    ws_data = json.load(f)
-                    
-                # Get the workspace or folder path
-                ws_path = ws_data.get('folder') or ws_data.get('workspace', '')
-                ws_path = ws_path.replace('file://', '').replace('%20', ' ')
-                ws_path = re.sub(r'%([0-9A-Fa-f]{2})', lambda m: chr(int(m.group(1), 16)), ws_path)
-                
-                # Determine project name
-                project_name = None
-                for name, path in TRACKED_PROJECTS.items():
-                    if path in ws_path or name in ws_path.lower():
-                        project_name = name
-                        break
-                
-                if not project_name:
-                    # Extract name from path
-                    project_name = Path(ws_path).stem if ws_path else ws_dir.name
-                
-                chat_sessions_dir = ws_dir / "chatSessions"
-                chat_files = list(chat_sessions_dir.glob("*.json")) if chat_sessions_dir.exists() else []
-                
-                workspace_map[ws_dir.name] = {
-                    'workspace_id': ws_dir.name,
-                    'workspace_path': ws_path,
-                    'project_name': project_name,
-                    'chat_sessions_dir': chat_sessions_dir,
-                    'chat_files': chat_files,
-                    'chat_count': len(chat_files),
-                }
-                
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"⚠️ Error parsing workspace {ws_dir.name}: {e}")
-                continue
+        # scandir hands back the d_type from getdents, so is_dir() needs no extra stat
+        with os.scandir(VSCODE_STORAGE_PATH) as it:
+            ws_dirs = [entry for entry in it if entry.is_dir()]
+        
+        # Workspace reads are small and independent; keep several in flight at once
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            for ws_info in pool.map(self._scan_workspace, ws_dirs):
+                if ws_info:
+                    workspace_map[ws_info['workspace_id']] = ws_info
                 
         return workspace_map
     
-    def _parse_chat_session(self, file_path: Path, workspace_info: Dict) -> Optional[ChatSession]:
-        """Parse a single chat session file."""
+    def _scan_workspace(self, ws_dir: os.DirEntry) -> Optional[Dict[str, Any]]:
+        """Read one workspace's workspace.json and list its chat session files.
+        
+        Most workspaces never had a chat, so chatSessions is listed first and
+        workspaces without chat files are dropped before workspace.json is read.
+        """
+        chat_sessions_dir = Path(ws_dir.path) / "chatSessions"
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            messages = []
-            requests = data.get('requests', [])
+            with os.scandir(chat_sessions_dir) as it:
+                chat_files = [entry for entry in it if entry.name.endswith('.json')]
+        except OSError:
+            return None
+        if not chat_files:
+            return None
+        
+        try:
+            with open(os.path.join(ws_dir.path, "workspace.json"), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
             
-            for req in requests:
-                # User message
-                user_msg = req.get('message', {})
-                user_text = user_msg.get('text', '') if isinstance(user_msg, dict) else str(user_msg)
-                
-                if user_text:
-                    messages.append(ChatMessage(
-                        role='user',
-                        content=user_text,
-                        timestamp=req.get('timestamp'),
-                    ))
-                
-                # Assistant response
-                response = req.get('response', {})
-                if isinstance(response, dict):
-                    # Extract response text from various formats
-                    response_text = ''
-                    
-                    # Try different response formats
-                    if 'value' in response:
-                        response_text = response['value']
-                    elif 'result' in response:
-                        result = response['result']
-                        if isinstance(result, dict):
-                            response_text = result.get('value', '') or result.get('message', '')
-                        else:
-                            response_text = str(result)
-                    elif 'message' in response:
-                        response_text = response['message']
-                        
-                    if response_text:
-                        messages.append(ChatMessage(
-                            role='assistant',
-                            content=response_text,
-                            model=response.get('model'),
-                        ))
+        try:
+            ws_data = _json_loads(raw)
             
-            # Parse timestamps
-            creation_ts = data.get('creationDate', 0)
-            last_msg_ts = data.get('lastMessageDate', creation_ts)
+            # Get the workspace or folder path
+            ws_path = ws_data.get('folder') or ws_data.get('workspace', '')
+            ws_path = unquote(ws_path.replace('file://', ''))
             
-            # Handle millisecond timestamps
-            if creation_ts > 1e12:
-                creation_ts /= 1000
-            if last_msg_ts > 1e12:
-                last_msg_ts /= 1000
-                
-            return ChatSession(
-                session_id=data.get('sessionId', file_path.stem),
-                workspace_name=workspace_info.get('project_name', 'unknown'),
-                workspace_path=workspace_info.get('workspace_path', ''),
-                creation_date=datetime.fromtimestamp(creation_ts) if creation_ts else datetime.now(),
-                last_message_date=datetime.fromtimestamp(last_msg_ts) if last_msg_ts else datetime.now(),
-                requester_username=data.get('requesterUsername', 'user'),
-                responder_username=data.get('responderUsername', 'GitHub Copilot'),
-                messages=messages,
-                file_path=str(file_path),
-                file_size=file_path.stat().st_size,
-                message_count=len(messages),
-            )
+            # Determine project name
+            m = _TRACKED_RE.match(f"{ws_path}\x00{ws_path.lower()}")
+            project_name = _TRACKED_ALTERNATIVES[m.lastindex - 1][0] if m else None
             
-        except Exception as e:
-            print(f"⚠️ Error parsing {file_path.name}: {e}")
+            if not project_name:
+                # Extract name from path
+                project_name = Path(ws_path).stem if ws_path else ws_dir.name
+            
+            return {
+                'workspace_id': ws_dir.name,
+                'workspace_path': ws_path,
+                'project_name': project_name,
+                'chat_sessions_dir': chat_sessions_dir,
+                'chat_files': chat_files,
+                'chat_count': len(chat_files),
+            }
+            
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"⚠️ Error parsing workspace {ws_dir.name}: {e}")
             return None
     
-    def backup_all(self, project_filter: Optional[str] = None) -> Dict[str, Any]:
+    def backup_all(self, project_filter: Optional[str] = None,
+                   skip_near_duplicates: bool = False) -> Dict[str, Any]:
         """Perform full backup of all chat sessions."""
         print("🔄 Starting Copilot Chat Backup...")
         
@@ -264,6 +733,8 @@ class CopilotChatBackup:
         }
         
         all_sessions = []
+        chat_files = []
+        tasks = []
         
         for ws_id, ws_info in self.workspace_map.items():
             project_name = ws_info['project_name']
@@ -277,27 +748,83 @@ class CopilotChatBackup:
                 
             stats['total_workspaces'] += 1
             
+            # Only the fields the parser needs, to keep pickling cheap
+            parse_info = {
+                'project_name': project_name,
+                'workspace_path': ws_info['workspace_path'],
+            }
             for chat_file in ws_info['chat_files']:
-                session = self._parse_chat_session(chat_file, ws_info)
-                if session:
-                    all_sessions.append(session)
-                    stats['total_sessions'] += 1
-                    stats['total_messages'] += session.message_count
-                    stats['total_size_bytes'] += session.file_size
-                    stats['projects'][project_name]['sessions'] += 1
-                    stats['projects'][project_name]['messages'] += session.message_count
-                    
-                    # Backup raw file
-                    self._backup_raw(chat_file, project_name)
+                chat_files.append((chat_file, project_name))
+                # DirEntry caches this stat for _backup_raw as well
+                tasks.append((chat_file.path, chat_file.stat().st_size, parse_info))
+        
+        # Files whose size and mtime match the cache reuse their earlier parse
+        results = [None] * len(tasks)
+        pending = []
+        for i, (chat_file, _) in enumerate(chat_files):
+            st = chat_file.stat()
+            hit = self._parse_cache.get(chat_file.path)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                results[i] = hit[2]
+            else:
+                pending.append(i)
+        
+        pending_tasks = [tasks[i] for i in pending]
+        if len(pending_tasks) < PARSE_PARALLEL_MIN:
+            parsed = map(_parse_chat_session, pending_tasks)
+        else:
+            with ProcessPoolExecutor() as pool:
+                parsed = list(pool.map(_parse_chat_session, pending_tasks, chunksize=16))
+        for i, fields in zip(pending, parsed):
+            results[i] = fields
+        
+        # A filtered run only refreshes its own entries; a full run also prunes deleted files
+        cache = self._parse_cache if project_filter else {}
+        
+        for (chat_file, project_name), fields, task in zip(chat_files, results, tasks):
+            if not fields:
+                continue
+            st = chat_file.stat()
+            cache[chat_file.path] = (st.st_size, st.st_mtime_ns, fields)
+            
+            # Workspace fields come from this run's discovery, not the cached parse
+            session = ChatSession(**{
+                **fields,
+                'workspace_name': task[2]['project_name'],
+                'workspace_path': task[2]['workspace_path'],
+                'messages': [ChatMessage(**m) for m in fields['messages']],
+            })
+            all_sessions.append(session)
+            stats['total_sessions'] += 1
+            stats['total_messages'] += session.message_count
+            stats['total_size_bytes'] += session.file_size
+            stats['projects'][project_name]['sessions'] += 1
+            stats['projects'][project_name]['messages'] += session.message_count
+            
+            # Backup raw file
+            self._backup_raw(chat_file, project_name)
+        
+        self._parse_cache = cache
+        self._save_parse_cache(cache)
         
         # Sort sessions by date
         all_sessions.sort(key=lambda s: s.last_message_date, reverse=True)
         
         # Generate outputs
-        self._generate_markdown(all_sessions)
-        self._generate_daily_summaries(all_sessions)
-        self._generate_ai_export(all_sessions)
-        self._generate_index(all_sessions, stats)
+        first_user_messages = self._generate_session_files(all_sessions)
+        self._generate_daily_summaries(all_sessions, first_user_messages)
+        
+        # Near-duplicate sessions (retries, copies across workspaces) stay backed up
+        # but are left out of the Q&A pairs; newest-first order keeps the latest copy
+        near_dups = set()
+        if skip_near_duplicates:
+            if DATASKETCH_AVAILABLE:
+                near_dups = _find_near_duplicates(all_sessions)
+            else:
+                print("⚠️ datasketch not installed, near-duplicate detection skipped (pip install datasketch)")
+        
+        self._generate_qa_pairs(all_sessions, near_dups)
+        self._generate_index(all_sessions, stats, first_user_messages)
         
         # Convert defaultdict to regular dict for JSON serialization
         stats['projects'] = dict(stats['projects'])
@@ -311,160 +838,188 @@ class CopilotChatBackup:
         
         return stats
     
-    def _backup_raw(self, file_path: Path, project_name: str):
+    def _backup_raw(self, chat_file: os.DirEntry, project_name: str):
         """Backup raw JSON file with organization."""
         project_dir = self.raw_backup_path / project_name
         project_dir.mkdir(parents=True, exist_ok=True)
         
         # Copy with date prefix
         date_str = datetime.now().strftime("%Y-%m-%d")
-        dest = project_dir / f"{date_str}_{file_path.name}"
+        dest = project_dir / f"{date_str}_{chat_file.name}"
+        
+        # Only copy if file has changed: copy2 keeps the source mtime, so an
+        # unchanged file has the same size and an mtime no newer than the copy
+        src_st = chat_file.stat()
+        try:
+            dest_st = dest.stat()
+        except FileNotFoundError:
+            dest_st = None
         
-        # Only copy if file has changed (compare hash)
-        if dest.exists():
-            existing_hash = hashlib.md5(dest.read_bytes()).hexdigest()
-            new_hash = hashlib.md5(file_path.read_bytes()).hexdigest()
-            if existing_hash == new_hash:
+        if dest_st and src_st.st_size == dest_st.st_size:
+            if src_st.st_mtime_ns <= dest_st.st_mtime_ns:
+                return
+            # Touched but possibly not modified - compare content before copying
+            if _file_digest(chat_file.path) == _file_digest(str(dest)):
+                os.utime(dest, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
                 return
         
-        shutil.copy2(file_path, dest)
+        _reflink_or_copy(chat_file.path, dest, src_st)
     
-    def _generate_markdown(self, sessions: List[ChatSession]):
-        """Generate readable markdown files for each session."""
-        for session in sessions:
-            project_dir = self.markdown_path / session.workspace_name
-            project_dir.mkdir(parents=True, exist_ok=True)
-            
-            date_str = session.creation_date.strftime("%Y-%m-%d_%H-%M")
-            filename = f"{date_str}_{session.session_id[:8]}.md"
-            filepath = project_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Copilot Chat Session\n\n")
-                f.write(f"**Project:** {session.workspace_name}\n")
-                f.write(f"**Session ID:** {session.session_id}\n")
-                f.write(f"**Created:** {session.creation_date.isoformat()}\n")
-                f.write(f"**Last Message:** {session.last_message_date.isoformat()}\n")
-                f.write(f"**Messages:** {session.message_count}\n")
-                f.write(f"**Workspace:** `{session.workspace_path}`\n\n")
-                f.write("---\n\n")
-                
-                for i, msg in enumerate(session.messages):
-                    if msg.role == 'user':
-                        f.write(f"## 👤 User\n\n")
-                    else:
-                        f.write(f"## 🤖 GitHub Copilot\n\n")
-                    
-                    # Clean and write content
-                    content = msg.content.strip()
-                    f.write(f"{content}\n\n")
-                    f.write("---\n\n")
-    
-    def _generate_daily_summaries(self, sessions: List[ChatSession]):
-        """Generate daily activity summaries."""
-        # Group sessions by date
-        by_date = defaultdict(list)
-        for session in sessions:
-            date_key = session.last_message_date.strftime("%Y-%m-%d")
-            by_date[date_key].append(session)
+    def _generate_session_files(self, sessions: List[ChatSession]) -> List[Optional[str]]:
+        """Write each session's markdown file and its full export/sessions.jsonl entries.
         
-        for date_str, day_sessions in by_date.items():
-            filepath = self.daily_path / f"{date_str}.md"
-            
-            # Calculate stats
-            total_messages = sum(s.message_count for s in day_sessions)
-            projects = defaultdict(int)
-            for s in day_sessions:
-                projects[s.workspace_name] += s.message_count
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Daily Copilot Activity - {date_str}\n\n")
-                f.write(f"## Summary\n\n")
-                f.write(f"- **Total Sessions:** {len(day_sessions)}\n")
-                f.write(f"- **Total Messages:** {total_messages}\n")
-                f.write(f"- **Projects Active:** {len(projects)}\n\n")
+        Every product comes from one _render_session pass over the messages, and
+        each export entry is written as soon as it is built, so peak memory stays
+        at one session. The full export is split into EXPORT_SHARD_SIZE-session
+        shards listed in full_export_manifest.json, so readers can load it piece
+        by piece. Returns each session's first user message for the summaries
+        and index.
+        """
+        first_user_messages = []
+        project_dirs = set()
+        markdown_writes = []
+        # Bounds how many rendered files wait in memory for a writer thread
+        in_flight = threading.BoundedSemaphore(MARKDOWN_WRITES_IN_FLIGHT)
+        
+        def write_markdown(filepath: Path, data: bytes):
+            try:
+                filepath.write_bytes(data)
+            finally:
+                in_flight.release()
+        
+        def iter_session_data(jsonl, pool):
+            for session in sessions:
+                rendered = _render_session(session)
+                first_user_messages.append(rendered.first_user_message)
                 
-                f.write(f"## Projects\n\n")
-                for project, msg_count in sorted(projects.items(), key=lambda x: -x[1]):
-                    f.write(f"- **{project}:** {msg_count} messages\n")
+                project_dir = self.markdown_path / session.workspace_name
+                if project_dir not in project_dirs:
+                    project_dir.mkdir(parents=True, exist_ok=True)
+                    project_dirs.add(project_dir)
+                date_str = session.creation_date.strftime("%Y-%m-%d_%H-%M")
                 
-                f.write(f"\n## Sessions\n\n")
-                for session in sorted(day_sessions, key=lambda s: s.last_message_date, reverse=True):
-                    time_str = session.last_message_date.strftime("%H:%M")
-                    f.write(f"### {time_str} - {session.workspace_name}\n\n")
-                    
-                    # Show first user message as topic
-                    for msg in session.messages:
-                        if msg.role == 'user':
-                            preview = msg.content[:200].replace('\n', ' ')
-                            if len(msg.content) > 200:
-                                preview += "..."
-                            f.write(f"> {preview}\n\n")
-                            break
-                    
-                    f.write(f"*{session.message_count} messages*\n\n")
-    
-    def _generate_ai_export(self, sessions: List[ChatSession]):
-        """Generate AI-friendly export formats."""
-        # Full JSON export
-        export_data = {
+                # Small-file writes overlap on the pool while rendering continues here
+                in_flight.acquire()
+                markdown_writes.append(pool.submit(
+                    write_markdown, project_dir / f"{date_str}_{session.session_id[:8]}.md",
+                    rendered.markdown))
+                
+                # JSONL format (one session per line - good for training/analysis)
+                jsonl.write(_json_dumps(rendered.export) + b'\n')
+                yield rendered.export
+        
+        # Write full export shards alongside sessions.jsonl
+        shards = []
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool, \
+                open(self.ai_export_path / "sessions.jsonl", 'wb') as jsonl:
+            exports = iter_session_data(jsonl, pool)
+            for first in exports:
+                shard_name = f"full_export_{len(shards):04d}.json"
+                with open(self.ai_export_path / shard_name, 'wb') as f:
+                    f.write(b'{\n  "shard": ' + str(len(shards)).encode() + b',\n  "sessions": ')
+                    count = _write_json_array(
+                        f, chain([first], islice(exports, EXPORT_SHARD_SIZE - 1)), level=1)
+                    f.write(b'\n}')
+                shards.append({'file': shard_name, 'sessions': count})
+        
+        # Surface the first failed markdown write, if any
+        for future in markdown_writes:
+            future.result()
+        
+        manifest = {
             'export_date': datetime.now().isoformat(),
             'total_sessions': len(sessions),
-            'sessions': []
+            'shard_size': EXPORT_SHARD_SIZE,
+            'shards': shards,
         }
+        manifest_path = self.ai_export_path / "full_export_manifest.json"
+        tmp_path = manifest_path.with_suffix('.tmp')
+        tmp_path.write_bytes(_json_dumps(manifest, indent=True))
+        os.replace(tmp_path, manifest_path)
         
-        for session in sessions:
-            session_data = {
-                'id': session.session_id,
-                'project': session.workspace_name,
-                'created': session.creation_date.isoformat(),
-                'last_message': session.last_message_date.isoformat(),
-                'message_count': session.message_count,
-                'conversation': []
-            }
+        # Drop shards left over from a larger earlier export, and the old single file
+        current = {shard['file'] for shard in shards}
+        for stale in self.ai_export_path.glob("full_export_[0-9]*.json"):
+            if stale.name not in current:
+                stale.unlink()
+        (self.ai_export_path / "full_export.json").unlink(missing_ok=True)
+        
+        return first_user_messages
+    
+    def _generate_daily_summaries(self, sessions: List[ChatSession],
+                                  first_user_messages: List[Optional[str]]):
+        """Generate daily activity summaries.
+        
+        Expects sessions sorted newest first (as backup_all leaves them), so each
+        day's sessions are already contiguous and in display order.
+        """
+        by_date = groupby(zip(sessions, first_user_messages),
+                          key=lambda pair: pair[0].last_message_date.strftime("%Y-%m-%d"))
+        
+        for date_str, group in by_date:
+            filepath = self.daily_path / f"{date_str}.md"
+            day_sessions = list(group)
             
-            for msg in session.messages:
-                session_data['conversation'].append({
-                    'role': msg.role,
-                    'content': msg.content,
-                })
+            # Calculate stats in one pass
+            total_messages = 0
+            projects = Counter()
+            for s, _ in day_sessions:
+                projects[s.workspace_name] += s.message_count
+                total_messages += s.message_count
             
-            export_data['sessions'].append(session_data)
-        
-        # Write full export
-        with open(self.ai_export_path / "full_export.json", 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+            parts = [
+                f"# Daily Copilot Activity - {date_str}\n\n",
+                "## Summary\n\n",
+                f"- **Total Sessions:** {len(day_sessions)}\n",
+                f"- **Total Messages:** {total_messages}\n",
+                f"- **Projects Active:** {len(projects)}\n\n",
+                "## Projects\n\n",
+            ]
+            ap = parts.append
+            
+            for project, msg_count in sorted(projects.items(), key=lambda x: -x[1]):
+                ap(f"- **{project}:** {msg_count} messages\n")
+            
+            ap("\n## Sessions\n\n")
+            for session, first_user_message in day_sessions:
+                time_str = session.last_message_date.strftime("%H:%M")
+                ap(f"### {time_str} - {session.workspace_name}\n\n")
+                
+                # Show first user message as topic
+                if first_user_message is not None:
+                    preview = first_user_message[:200].replace('\n', ' ')
+                    if len(first_user_message) > 200:
+                        preview += "..."
+                    ap(f"> {preview}\n\n")
+                
+                ap(f"*{session.message_count} messages*\n\n")
+            
+            filepath.write_bytes("".join(parts).encode('utf-8'))
+    
+    def _generate_qa_pairs(self, sessions: List[ChatSession], near_dups: Set[int] = frozenset()):
+        """Write the Q&A pair exports, streaming each pair as it is found.
         
-        # Write JSONL format (one session per line - good for training/analysis)
-        with open(self.ai_export_path / "sessions.jsonl", 'w', encoding='utf-8') as f:
-            for session_data in export_data['sessions']:
-                f.write(json.dumps(session_data, ensure_ascii=False) + '\n')
+        Sessions whose index is in near_dups are left out.
+        """
+        def iter_qa(jsonl):
+            unique_sessions = [s for i, s in enumerate(sessions) if i not in near_dups]
+            for qa in _iter_qa_pairs(unique_sessions):
+                jsonl.write(_json_dumps(qa) + b'\n')
+                yield qa
         
         # Write conversations only (for embeddings/RAG)
-        conversations = []
-        for session in sessions:
-            for i in range(0, len(session.messages), 2):
-                if i + 1 < len(session.messages):
-                    user_msg = session.messages[i]
-                    assistant_msg = session.messages[i + 1]
-                    if user_msg.role == 'user' and assistant_msg.role == 'assistant':
-                        conversations.append({
-                            'project': session.workspace_name,
-                            'date': session.last_message_date.isoformat(),
-                            'question': user_msg.content,
-                            'answer': assistant_msg.content,
-                        })
-        
-        with open(self.ai_export_path / "qa_pairs.json", 'w', encoding='utf-8') as f:
-            json.dump(conversations, f, indent=2, ensure_ascii=False)
-        
-        with open(self.ai_export_path / "qa_pairs.jsonl", 'w', encoding='utf-8') as f:
-            for qa in conversations:
-                f.write(json.dumps(qa, ensure_ascii=False) + '\n')
-        
-        print(f"   📤 AI Export: {len(conversations)} Q&A pairs extracted")
-    
-    def _generate_index(self, sessions: List[ChatSession], stats: Dict):
+        with open(self.ai_export_path / "qa_pairs.json", 'wb') as f, \
+                open(self.ai_export_path / "qa_pairs.jsonl", 'wb') as jsonl:
+            qa_count = _write_json_array(f, iter_qa(jsonl))
+        
+        if near_dups:
+            print(f"   📤 AI Export: {qa_count} Q&A pairs extracted "
+                  f"({len(near_dups)} near-duplicate sessions skipped)")
+        else:
+            print(f"   📤 AI Export: {qa_count} Q&A pairs extracted")
+    
+    def _generate_index(self, sessions: List[ChatSession], stats: Dict,
+                        first_user_messages: List[Optional[str]]):
         """Generate master index and search-friendly catalog."""
         index = {
             'generated': datetime.now().isoformat(),
@@ -474,7 +1029,7 @@ class CopilotChatBackup:
             'by_date': defaultdict(list),
         }
         
-        for session in sessions:
+        for session, first_user_message in zip(sessions, first_user_messages):
             session_summary = {
                 'id': session.session_id,
                 'project': session.workspace_name,
@@ -482,15 +1037,10 @@ class CopilotChatBackup:
                 'last_message': session.last_message_date.isoformat(),
                 'message_count': session.message_count,
                 'file_size': session.file_size,
-                'first_message_preview': '',
+                # First user message as preview
+                'first_message_preview': (first_user_message or '')[:300],
             }
             
-            # Get first user message as preview
-            for msg in session.messages:
-                if msg.role == 'user':
-                    session_summary['first_message_preview'] = msg.content[:300]
-                    break
-            
             index['sessions'].append(session_summary)
             index['by_project'][session.workspace_name].append(session_summary)
             
@@ -501,37 +1051,21 @@ class CopilotChatBackup:
         index['by_project'] = dict(index['by_project'])
         index['by_date'] = dict(index['by_date'])
         
-        with open(self.index_path / "master_index.json", 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        (self.index_path / "master_index.json").write_bytes(_json_dumps(index, indent=True))
         
         # Generate README
-        with open(self.backup_path / "README.md", 'w', encoding='utf-8') as f:
-            f.write("# Copilot Chat Backup\n\n")
-            f.write(f"**Last Backup:** {datetime.now().isoformat()}\n\n")
-            f.write("## Structure\n\n")
-            f.write("```\n")
-            f.write("copilot-chat-backups/\n")
-            f.write("├── raw/              # Original JSON files by project\n")
-            f.write("├── markdown/         # Human-readable markdown by project\n")
-            f.write("├── daily/            # Daily activity summaries\n")
-            f.write("├── ai-export/        # AI-friendly formats\n")
-            f.write("│   ├── full_export.json    # Complete export\n")
-            f.write("│   ├── sessions.jsonl      # One session per line\n")
-            f.write("│   ├── qa_pairs.json       # Question-answer pairs\n")
-            f.write("│   └── qa_pairs.jsonl      # Q&A pairs (JSONL)\n")
-            f.write("├── index/            # Search indexes\n")
-            f.write("│   └── master_index.json\n")
-            f.write("└── README.md\n")
-            f.write("```\n\n")
-            
-            f.write("## Statistics\n\n")
-            f.write(f"- **Total Sessions:** {stats['total_sessions']}\n")
-            f.write(f"- **Total Messages:** {stats['total_messages']}\n")
-            f.write(f"- **Total Size:** {stats['total_size_bytes'] / (1024*1024):.2f} MB\n\n")
-            
-            f.write("## Projects\n\n")
-            for project, data in sorted(stats['projects'].items()):
-                f.write(f"- **{project}:** {data['sessions']} sessions, {data['messages']} messages\n")
+        readme = README_TEMPLATE.format(
+            timestamp=datetime.now().isoformat(),
+            tree=BACKUP_TREE,
+            total_sessions=stats['total_sessions'],
+            total_messages=stats['total_messages'],
+            total_size_mb=stats['total_size_bytes'] / (1024*1024),
+            projects="".join(
+                f"- **{project}:** {data['sessions']} sessions, {data['messages']} messages\n"
+                for project, data in sorted(stats['projects'].items())
+            ),
+        )
+        (self.backup_path / "README.md").write_bytes(readme.encode('utf-8'))
 
 
 def main():
@@ -546,6 +1080,8 @@ def main():
                         help='Generate AI export only')
     parser.add_argument('--list-workspaces', action='store_true',
                         help='List discovered workspaces and exit')
+    parser.add_argument('--skip-near-duplicates', action='store_true',
+                        help='Leave near-duplicate sessions out of the Q&A pairs (needs datasketch)')
     
     args = parser.parse_args()
     
@@ -562,7 +1098,8 @@ def main():
                 print()
         return
     
-    backup.backup_all(project_filter=args.workspace)
+    backup.backup_all(project_filter=args.workspace,
+                      skip_near_duplicates=args.skip_near_duplicates)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,10 @@ Uses SQLite to persist all metrics, sessions, and workspace data.
 
 import sqlite3
 import json
+import atexit
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import logging
@@ -14,20 +17,131 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when setup_database gains a migration step; stored in PRAGMA user_version
+SCHEMA_VERSION = 2
+
+# Session ids per IN (...) query, well under SQLite's bound-variable limit
+SESSION_ID_CHUNK = 500
+
 class BackupDatabase:
     """SQLite database manager for chat backup metrics."""
     
+    # Statements used per row/session; kept as constants so every call hits the
+    # connection's prepared-statement cache with the same SQL text
+    _SQL_INSERT_BACKUP_RUN = """
+        INSERT INTO backup_runs 
+        (timestamp, total_sessions, total_messages, total_size_bytes, total_workspaces)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_SESSION = """
+        INSERT OR REPLACE INTO sessions 
+        (backup_run_id, session_id, project, message_count, user_messages, 
+         assistant_messages, duration_seconds, created_at, last_message_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_WORKSPACE = """
+        INSERT INTO workspaces 
+        (backup_run_id, workspace_name, session_count, total_messages, 
+         avg_messages_per_session, active_days, first_session, last_session)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_HOURLY_ACTIVITY = """
+        INSERT INTO hourly_activity (backup_run_id, hour, message_count)
+        VALUES (?, ?, ?)
+    """
+    _SQL_INSERT_DAILY_ACTIVITY = """
+        INSERT INTO daily_activity (backup_run_id, date, message_count)
+        VALUES (?, ?, ?)
+    """
+    _SQL_SELECT_CHAT_SESSION_HASH = "SELECT file_hash FROM chat_sessions WHERE session_id = ?"
+    _SQL_DELETE_CHAT_MESSAGES = "DELETE FROM chat_messages WHERE session_id = ?"
+    _SQL_UPDATE_CHAT_SESSION = """
+        UPDATE chat_sessions SET
+            workspace_id = ?,
+            workspace_name = ?,
+            workspace_path = ?,
+            project_name = ?,
+            creation_date = ?,
+            last_message_date = ?,
+            requester_username = ?,
+            responder_username = ?,
+            message_count = ?,
+            file_path = ?,
+            file_size = ?,
+            file_hash = ?,
+            synced_at = ?,
+            custom_title = ?,
+            initial_location = ?,
+            mode_id = ?,
+            mode_kind = ?,
+            selected_model_identifier = ?,
+            selected_model_name = ?,
+            selected_model_vendor = ?,
+            selected_model_family = ?,
+            request_model_id = ?,
+            agent_id = ?,
+            agent_name = ?,
+            has_pending_edits = ?,
+            input_text = ?,
+            attachments_count = ?,
+            selections_count = ?,
+            content_references_count = ?,
+            code_citations_count = ?,
+            repo_name = ?,
+            repo_owner = ?,
+            repo_branch = ?,
+            repo_default_branch = ?,
+            session_type = ?,
+            edit_file_paths = ?,
+            edit_line_count = ?,
+            edit_files_count = ?
+        WHERE session_id = ?
+    """
+    _SQL_INSERT_CHAT_SESSION = """
+        INSERT INTO chat_sessions (
+            session_id, workspace_id, workspace_name, workspace_path, project_name,
+            creation_date, last_message_date, requester_username, responder_username,
+            message_count, file_path, file_size, file_hash, synced_at,
+            custom_title, initial_location, mode_id, mode_kind,
+            selected_model_identifier, selected_model_name, selected_model_vendor, selected_model_family,
+            request_model_id, agent_id, agent_name, has_pending_edits, input_text,
+            attachments_count, selections_count, content_references_count, code_citations_count,
+            repo_name, repo_owner, repo_branch, repo_default_branch,
+            session_type, edit_file_paths, edit_line_count, edit_files_count
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_CHAT_MESSAGE = """
+        INSERT INTO chat_messages (session_id, position, role, content, timestamp, model)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_CHAT_SYNC_RUN = """
+        INSERT INTO chat_sync_runs (
+            started_at, finished_at, total_sessions, inserted_sessions,
+            updated_sessions, skipped_sessions, errors
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def __init__(self, db_path: str = "copilot_backup.db"):
         """Initialize database connection."""
         self.db_path = Path(db_path)
         self.conn = None
         self.setup_database()
+        # Make sure close() (and its PRAGMA optimize) runs even if the caller forgets
+        atexit.register(self.close)
     
     def setup_database(self):
         """Create database tables if they don't exist."""
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(str(self.db_path), cached_statements=256)
         self.conn.row_factory = sqlite3.Row
-        
+
+        # WAL lets readers run during a sync; NORMAL skips the fsync per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+
         # Create tables
         self.conn.executescript("""
             -- Backup runs table
@@ -97,7 +211,7 @@ class BackupDatabase:
             CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project);
             CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
             CREATE INDEX IF NOT EXISTS idx_workspaces_name ON workspaces(workspace_name);
-            CREATE INDEX IF NOT EXISTS idx_daily_activity_date ON daily_activity(date);
+            CREATE INDEX IF NOT EXISTS idx_daily_activity_date_messages ON daily_activity(date, message_count);
 
             -- Chat content tables
             CREATE TABLE IF NOT EXISTS chat_sessions (
@@ -171,9 +285,66 @@ class BackupDatabase:
         """)
         
         self.conn.commit()
-        self._ensure_chat_sessions_columns()
+        
+        # Migrations only need to run once per database file
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._ensure_chat_sessions_columns()
+            # Superseded by the covering idx_daily_activity_date_messages
+            self.conn.execute("DROP INDEX IF EXISTS idx_daily_activity_date")
+            # Let the planner see the new indexes straight away
+            self.conn.execute("ANALYZE")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        self.fts_available = self._ensure_chat_sessions_fts()
         logger.info(f"Database initialized at {self.db_path}")
 
+    def _ensure_chat_sessions_fts(self) -> bool:
+        """Create the substring index over chat_sessions; False if SQLite lacks FTS5 trigram."""
+        existed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'chat_sessions_fts'"
+        ).fetchone()
+        
+        # External content (kept in sync by triggers); the trigram tokenizer
+        # makes MATCH a case-insensitive substring search like LIKE '%x%'
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS chat_sessions_fts USING fts5(
+                    workspace_name, project_name, custom_title, input_text,
+                    content='chat_sessions', tokenize='trigram'
+                );
+                
+                CREATE TRIGGER IF NOT EXISTS chat_sessions_ai AFTER INSERT ON chat_sessions BEGIN
+                    INSERT INTO chat_sessions_fts(rowid, workspace_name, project_name, custom_title, input_text)
+                    VALUES (new.rowid, new.workspace_name, new.project_name, new.custom_title, new.input_text);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS chat_sessions_ad AFTER DELETE ON chat_sessions BEGIN
+                    INSERT INTO chat_sessions_fts(chat_sessions_fts, rowid, workspace_name, project_name, custom_title, input_text)
+                    VALUES ('delete', old.rowid, old.workspace_name, old.project_name, old.custom_title, old.input_text);
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS chat_sessions_au AFTER UPDATE ON chat_sessions BEGIN
+                    INSERT INTO chat_sessions_fts(chat_sessions_fts, rowid, workspace_name, project_name, custom_title, input_text)
+                    VALUES ('delete', old.rowid, old.workspace_name, old.project_name, old.custom_title, old.input_text);
+                    INSERT INTO chat_sessions_fts(rowid, workspace_name, project_name, custom_title, input_text)
+                    VALUES (new.rowid, new.workspace_name, new.project_name, new.custom_title, new.input_text);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            return False  # SQLite built without FTS5 (or older than 3.34); fall back to LIKE
+        
+        if not existed:
+            # Index the sessions synced before the table existed
+            with self.conn:
+                self.conn.execute("INSERT INTO chat_sessions_fts(chat_sessions_fts) VALUES ('rebuild')")
+        return True
+
+    def _raw_cursor(self) -> sqlite3.Cursor:
+        """Cursor returning plain tuples, for bulk reads that build their own dicts."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
     def _ensure_chat_sessions_columns(self):
         """Ensure new metadata columns exist on chat_sessions table."""
         cursor = self.conn.cursor()
@@ -218,75 +389,62 @@ class BackupDatabase:
     
     def save_backup_run(self, metrics: Dict[str, Any]) -> int:
         """Save a complete backup run with all metrics."""
-        cursor = self.conn.cursor()
-        
-        # Save backup run summary
-        cursor.execute("""
-            INSERT INTO backup_runs 
-            (timestamp, total_sessions, total_messages, total_size_bytes, total_workspaces)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            metrics.get('timestamp'),
-            metrics['totals']['sessions'],
-            metrics['totals']['messages'],
-            metrics['totals']['size_bytes'],
-            metrics['totals']['workspaces']
-        ))
-        
-        backup_run_id = cursor.lastrowid
+        temporal = metrics.get('temporal', {})
         
-        # Save sessions
-        for session in metrics.get('sessions', []):
-            cursor.execute("""
-                INSERT OR REPLACE INTO sessions 
-                (backup_run_id, session_id, project, message_count, user_messages, 
-                 assistant_messages, duration_seconds, created_at, last_message_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                backup_run_id,
-                session['session_id'],
-                session['project'],
-                session['message_count'],
-                session['user_messages'],
-                session['assistant_messages'],
-                session['duration_seconds'],
-                session['created_at'],
-                session['last_message_at']
-            ))
-        
-        # Save workspaces
-        for workspace_name, workspace_data in metrics.get('workspaces', {}).items():
-            cursor.execute("""
-                INSERT INTO workspaces 
-                (backup_run_id, workspace_name, session_count, total_messages, 
-                 avg_messages_per_session, active_days, first_session, last_session)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                backup_run_id,
-                workspace_name,
-                workspace_data['session_count'],
-                workspace_data['total_messages'],
-                workspace_data['avg_messages_per_session'],
-                workspace_data['active_days'],
-                workspace_data['first_session'],
-                workspace_data['last_session']
-            ))
-        
-        # Save hourly activity
-        for hour, count in metrics.get('temporal', {}).get('hourly', {}).items():
-            cursor.execute("""
-                INSERT INTO hourly_activity (backup_run_id, hour, message_count)
-                VALUES (?, ?, ?)
-            """, (backup_run_id, int(hour), count))
-        
-        # Save daily activity
-        for date, count in metrics.get('temporal', {}).get('daily', {}).items():
-            cursor.execute("""
-                INSERT INTO daily_activity (backup_run_id, date, message_count)
-                VALUES (?, ?, ?)
-            """, (backup_run_id, date, count))
+        # One transaction, one prepared statement per table
+        with self.conn:
+            # Save backup run summary
+            backup_run_id = self.conn.execute(self._SQL_INSERT_BACKUP_RUN, (
+                metrics.get('timestamp'),
+                metrics['totals']['sessions'],
+                metrics['totals']['messages'],
+                metrics['totals']['size_bytes'],
+                metrics['totals']['workspaces']
+            )).lastrowid
+            
+            # Save sessions
+            self.conn.executemany(self._SQL_INSERT_SESSION, [
+                (
+                    backup_run_id,
+                    session['session_id'],
+                    session['project'],
+                    session['message_count'],
+                    session['user_messages'],
+                    session['assistant_messages'],
+                    session['duration_seconds'],
+                    session['created_at'],
+                    session['last_message_at']
+                )
+                for session in metrics.get('sessions', [])
+            ])
+            
+            # Save workspaces
+            self.conn.executemany(self._SQL_INSERT_WORKSPACE, [
+                (
+                    backup_run_id,
+                    workspace_name,
+                    workspace_data['session_count'],
+                    workspace_data['total_messages'],
+                    workspace_data['avg_messages_per_session'],
+                    workspace_data['active_days'],
+                    workspace_data['first_session'],
+                    workspace_data['last_session']
+                )
+                for workspace_name, workspace_data in metrics.get('workspaces', {}).items()
+            ])
+            
+            # Save hourly activity
+            self.conn.executemany(self._SQL_INSERT_HOURLY_ACTIVITY, [
+                (backup_run_id, int(hour), count)
+                for hour, count in temporal.get('hourly', {}).items()
+            ])
+            
+            # Save daily activity
+            self.conn.executemany(self._SQL_INSERT_DAILY_ACTIVITY, [
+                (backup_run_id, date, count)
+                for date, count in temporal.get('daily', {}).items()
+            ])
         
-        self.conn.commit()
         logger.info(f"Saved backup run #{backup_run_id} with {len(metrics.get('sessions', []))} sessions")
         
         return backup_run_id
@@ -366,28 +524,41 @@ class BackupDatabase:
             'date_range': date_range
         }
     
-    def export_to_json(self, output_file: str):
-        """Export all data to JSON file."""
-        data = {
-            'backup_runs': [dict(row) for row in self.conn.execute("SELECT * FROM backup_runs").fetchall()],
-            'sessions': [dict(row) for row in self.conn.execute("SELECT * FROM sessions").fetchall()],
-            'workspaces': [dict(row) for row in self.conn.execute("SELECT * FROM workspaces").fetchall()],
-            'export_timestamp': datetime.now().isoformat()
-        }
+    def export_to_json(self, output_file: str, pretty: bool = False):
+        """Export all data to JSON file.
+        
+        Rows are written one at a time as they are fetched, so memory stays flat
+        however large the tables are. Output is compact unless pretty is set, in
+        which case it matches json.dump(..., indent=2).
+        """
+        indent = 2 if pretty else None
+        entry_sep = ',\n  ' if pretty else ', '
+        item_sep = ',' if pretty else ', '
+        item_lead = '\n    ' if pretty else ''
         
         with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
+            f.write('{\n  ' if pretty else '{')
+            for table in ('backup_runs', 'sessions', 'workspaces'):
+                f.write(f'"{table}": [')
+                cursor = self._raw_cursor()
+                cursor.execute(f"SELECT * FROM {table}")
+                columns = [d[0] for d in cursor.description]
+                rows = 0
+                for row in cursor:
+                    item = json.dumps(dict(zip(columns, row)), indent=indent)
+                    if pretty:
+                        item = item.replace('\n', item_lead)
+                    f.write((item_sep if rows else '') + item_lead + item)
+                    rows += 1
+                f.write(('\n  ]' if pretty and rows else ']') + entry_sep)
+            f.write(f'"export_timestamp": {json.dumps(datetime.now().isoformat())}')
+            f.write('\n}' if pretty else '}')
         
         logger.info(f"Exported database to {output_file}")
 
     def get_chat_session_hash(self, session_id: str) -> Optional[str]:
         """Get stored file hash for a chat session."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT file_hash FROM chat_sessions WHERE session_id = ?",
-            (session_id,)
-        )
-        row = cursor.fetchone()
+        row = self.conn.execute(self._SQL_SELECT_CHAT_SESSION_HASH, (session_id,)).fetchone()
         return row['file_hash'] if row else None
 
     def upsert_chat_session(
@@ -398,6 +569,9 @@ class BackupDatabase:
     ) -> str:
         """Insert or update a chat session and its messages.
 
+        Does not commit: a sync run is one transaction, committed by
+        record_chat_sync_run (or by the caller between batches).
+
         Returns: 'inserted', 'updated', or 'skipped'.
         """
         session_id = session['session_id']
@@ -406,54 +580,12 @@ class BackupDatabase:
         if existing_hash and existing_hash == file_hash:
             return 'skipped'
 
-        cursor = self.conn.cursor()
         now = datetime.now().isoformat()
 
         if existing_hash:
-            cursor.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
-            cursor.execute(
-                """
-                UPDATE chat_sessions SET
-                    workspace_id = ?,
-                    workspace_name = ?,
-                    workspace_path = ?,
-                    project_name = ?,
-                    creation_date = ?,
-                    last_message_date = ?,
-                    requester_username = ?,
-                    responder_username = ?,
-                    message_count = ?,
-                    file_path = ?,
-                    file_size = ?,
-                    file_hash = ?,
-                    synced_at = ?,
-                    custom_title = ?,
-                    initial_location = ?,
-                    mode_id = ?,
-                    mode_kind = ?,
-                    selected_model_identifier = ?,
-                    selected_model_name = ?,
-                    selected_model_vendor = ?,
-                    selected_model_family = ?,
-                    request_model_id = ?,
-                    agent_id = ?,
-                    agent_name = ?,
-                    has_pending_edits = ?,
-                    input_text = ?,
-                    attachments_count = ?,
-                    selections_count = ?,
-                    content_references_count = ?,
-                    code_citations_count = ?,
-                    repo_name = ?,
-                    repo_owner = ?,
-                    repo_branch = ?,
-                    repo_default_branch = ?,
-                    session_type = ?,
-                    edit_file_paths = ?,
-                    edit_line_count = ?,
-                    edit_files_count = ?
-                WHERE session_id = ?
-                """,
+            self.conn.execute(self._SQL_DELETE_CHAT_MESSAGES, (session_id,))
+            self.conn.execute(
+                self._SQL_UPDATE_CHAT_SESSION,
                 (
                     session.get('workspace_id'),
                     session.get('workspace_name'),
@@ -498,20 +630,8 @@ class BackupDatabase:
             )
             status = 'updated'
         else:
-            cursor.execute(
-                """
-                INSERT INTO chat_sessions (
-                    session_id, workspace_id, workspace_name, workspace_path, project_name,
-                    creation_date, last_message_date, requester_username, responder_username,
-                    message_count, file_path, file_size, file_hash, synced_at,
-                    custom_title, initial_location, mode_id, mode_kind,
-                    selected_model_identifier, selected_model_name, selected_model_vendor, selected_model_family,
-                    request_model_id, agent_id, agent_name, has_pending_edits, input_text,
-                    attachments_count, selections_count, content_references_count, code_citations_count,
-                    repo_name, repo_owner, repo_branch, repo_default_branch,
-                    session_type, edit_file_paths, edit_line_count, edit_files_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            self.conn.execute(
+                self._SQL_INSERT_CHAT_SESSION,
                 (
                     session_id,
                     session.get('workspace_id'),
@@ -556,12 +676,9 @@ class BackupDatabase:
             )
             status = 'inserted'
 
-        for msg in messages:
-            cursor.execute(
-                """
-                INSERT INTO chat_messages (session_id, position, role, content, timestamp, model)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+        self.conn.executemany(
+            self._SQL_INSERT_CHAT_MESSAGE,
+            [
                 (
                     session_id,
                     msg.get('position'),
@@ -570,32 +687,28 @@ class BackupDatabase:
                     msg.get('timestamp'),
                     msg.get('model'),
                 )
-            )
+                for msg in messages
+            ]
+        )
 
-        self.conn.commit()
         return status
 
     def record_chat_sync_run(self, stats: Dict[str, Any]) -> int:
         """Record a chat sync run summary."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO chat_sync_runs (
-                started_at, finished_at, total_sessions, inserted_sessions,
-                updated_sessions, skipped_sessions, errors
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                stats['started_at'],
-                stats['finished_at'],
-                stats['total_sessions'],
-                stats['inserted_sessions'],
-                stats['updated_sessions'],
-                stats['skipped_sessions'],
-                stats['errors'],
+        # Commits everything the sync run wrote via upsert_chat_session too
+        with self.conn:
+            cursor = self.conn.execute(
+                self._SQL_INSERT_CHAT_SYNC_RUN,
+                (
+                    stats['started_at'],
+                    stats['finished_at'],
+                    stats['total_sessions'],
+                    stats['inserted_sessions'],
+                    stats['updated_sessions'],
+                    stats['skipped_sessions'],
+                    stats['errors'],
+                )
             )
-        )
-        self.conn.commit()
         return cursor.lastrowid
 
     def get_last_chat_sync_time(self) -> Optional[str]:
@@ -607,8 +720,22 @@ class BackupDatabase:
 
     def get_chat_sessions_for_vectorization(self, workspace: Optional[str] = None) -> List[Dict[str, Any]]:
         """Return chat sessions with aggregated conversation text for vectorization."""
-        cursor = self.conn.cursor()
-        if workspace:
+        cursor = self._raw_cursor()
+        # Trigrams need at least three characters; shorter filters scan with LIKE
+        if workspace and self.fts_available and len(workspace) >= 3:
+            phrase = '"' + workspace.replace('"', '""') + '"'
+            cursor.execute(
+                """
+                SELECT * FROM chat_sessions
+                WHERE rowid IN (
+                    SELECT rowid FROM chat_sessions_fts
+                    WHERE chat_sessions_fts MATCH ?
+                )
+                ORDER BY last_message_date DESC
+                """,
+                (f"{{workspace_name project_name}} : {phrase}",)
+            )
+        elif workspace:
             cursor.execute(
                 """
                 SELECT * FROM chat_sessions
@@ -622,20 +749,38 @@ class BackupDatabase:
                 "SELECT * FROM chat_sessions ORDER BY last_message_date DESC"
             )
 
-        sessions = [dict(row) for row in cursor.fetchall()]
+        columns = [d[0] for d in cursor.description]
+        sessions = [dict(zip(columns, row)) for row in cursor.fetchall()]
         results: List[Dict[str, Any]] = []
 
-        for session in sessions:
+        # Fetch messages for many sessions per query instead of one query each
+        session_ids = [session['session_id'] for session in sessions]
+        messages_by_session: Dict[str, List[Dict[str, Any]]] = {}
+        for start in range(0, len(session_ids), SESSION_ID_CHUNK):
+            chunk = session_ids[start:start + SESSION_ID_CHUNK]
             cursor.execute(
-                """
-                SELECT role, content, timestamp, model, position
+                f"""
+                SELECT session_id, role, content, timestamp, model, position
                 FROM chat_messages
-                WHERE session_id = ?
-                ORDER BY position ASC
+                WHERE session_id IN ({','.join('?' * len(chunk))})
+                ORDER BY session_id, position ASC
                 """,
-                (session['session_id'],)
+                chunk
             )
-            messages = [dict(row) for row in cursor.fetchall()]
+            for session_id, rows in groupby(cursor, key=itemgetter(0)):
+                messages_by_session[session_id] = [
+                    {
+                        'role': role,
+                        'content': content,
+                        'timestamp': timestamp,
+                        'model': model,
+                        'position': position,
+                    }
+                    for _, role, content, timestamp, model, position in rows
+                ]
+
+        for session in sessions:
+            messages = messages_by_session.get(session['session_id'], [])
 
             full_conversation = "\n---\n".join(m['content'] for m in messages if m.get('content'))
             title = ""
@@ -660,8 +805,19 @@ class BackupDatabase:
     
     def close(self):
         """Close database connection."""
+        atexit.unregister(self.close)
         if self.conn:
+            # Refresh planner statistics for the indexes used since opening;
+            # the first time round there are none yet, so gather them all
+            try:
+                analyzed = self.conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+                ).fetchone()
+                self.conn.execute("PRAGMA optimize" if analyzed else "ANALYZE")
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize failed: {e}")
             self.conn.close()
+            self.conn = None
             logger.info("Database connection closed")
 
 
@@ -675,6 +831,7 @@ def main():
     parser.add_argument('--workspace', type=str, help='Show history for specific workspace')
     parser.add_argument('--trend', type=int, metavar='DAYS', help='Show activity trend for N days')
     parser.add_argument('--export', type=str, metavar='FILE', help='Export data to JSON file')
+    parser.add_argument('--pretty', action='store_true', help='Indent the --export output')
     parser.add_argument('--db', type=str, default='copilot_backup.db', help='Database file path')
     
     args = parser.parse_args()
@@ -719,7 +876,7 @@ def main():
                 print(f"{day['date']}: {day['total_messages']} messages")
         
         elif args.export:
-            db.export_to_json(args.export)
+            db.export_to_json(args.export, pretty=args.pretty)
             print(f"✅ Exported to {args.export}")
         
         else:
@@ -45,6 +45,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger('metrics-exporter')
 
+
+def load_export_sessions(ai_export_dir: Path) -> List[Dict]:
+    """Load exported sessions from the sharded full export (or a legacy full_export.json)."""
+    manifest_path = ai_export_dir / "full_export_manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        sessions = []
+        for shard in manifest.get('shards', []):
+            with open(ai_export_dir / shard['file'], 'r') as f:
+                sessions.extend(json.load(f).get('sessions', []))
+        return sessions
+    
+    legacy_path = ai_export_dir / "full_export.json"
+    if legacy_path.exists():
+        with open(legacy_path, 'r') as f:
+            return json.load(f).get('sessions', [])
+    return []
+
 # =============================================================================
 # Data Classes
 # =============================================================================
@@ -145,13 +164,7 @@ class MetricsCollector:
         
         try:
             # Load AI export data if available
-            ai_export_path = self.backup_path / "ai-export" / "full_export.json"
-            sessions_data = []
-            
-            if ai_export_path.exists():
-                with open(ai_export_path, 'r') as f:
-                    export = json.load(f)
-                    sessions_data = export.get('sessions', [])
+            sessions_data = load_export_sessions(self.backup_path / "ai-export")
             
             # Process sessions
             session_metrics = []
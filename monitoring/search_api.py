@@ -53,6 +53,25 @@ COLLECTION_NAME = "copilot_chats"
 EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 dimension
 
 
+def load_export_sessions(ai_export_dir: Path) -> List[Dict]:
+    """Load exported sessions from the sharded full export (or a legacy full_export.json)."""
+    manifest_path = ai_export_dir / "full_export_manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        sessions = []
+        for shard in manifest.get('shards', []):
+            with open(ai_export_dir / shard['file'], 'r') as f:
+                sessions.extend(json.load(f).get('sessions', []))
+        return sessions
+    
+    legacy_path = ai_export_dir / "full_export.json"
+    if legacy_path.exists():
+        with open(legacy_path, 'r') as f:
+            return json.load(f).get('sessions', [])
+    return []
+
+
 # =============================================================================
 # Data Classes
 # =============================================================================
@@ -719,12 +738,7 @@ class SearchAPIHandler(BaseHTTPRequestHandler):
     
     def _load_sessions(self) -> List[Dict]:
         """Load sessions from backup."""
-        export_path = self.backup_path / "ai-export" / "full_export.json"
-        if export_path.exists():
-            with open(export_path, 'r') as f:
-                data = json.load(f)
-                return data.get('sessions', [])
-        return []
+        return load_export_sessions(self.backup_path / "ai-export")
     
     def _send_json(self, data: Dict):
         """Send JSON response."""
@@ -784,15 +798,11 @@ def main():
     
     # Initial indexing
     logger.info("Performing initial indexing...")
-    export_path = backup_path / "ai-export" / "full_export.json"
-    if export_path.exists():
-        with open(export_path, 'r') as f:
-            data = json.load(f)
-            sessions = data.get('sessions', [])
-            if sessions:
-                engine.index_sessions(sessions)
+    sessions = load_export_sessions(backup_path / "ai-export")
+    if sessions:
+        engine.index_sessions(sessions)
     else:
-        logger.warning(f"No export file found at {export_path}")
+        logger.warning(f"No exported sessions found in {backup_path / 'ai-export'}")
     
     # Set up handler
     SearchAPIHandler.engine = engine
@@ -29,13 +29,32 @@ from typing import List, Dict, Any, Optional
 DEFAULT_BACKUP_PATH = Path.home() / "copilot-chat-backups"
 
 
+def load_export_sessions(ai_export_dir: Path) -> List[Dict]:
+    """Load exported sessions from the sharded full export (or a legacy full_export.json)."""
+    manifest_path = ai_export_dir / "full_export_manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        sessions = []
+        for shard in manifest.get('shards', []):
+            with open(ai_export_dir / shard['file'], 'r') as f:
+                sessions.extend(json.load(f).get('sessions', []))
+        return sessions
+    
+    legacy_path = ai_export_dir / "full_export.json"
+    if legacy_path.exists():
+        with open(legacy_path, 'r') as f:
+            return json.load(f).get('sessions', [])
+    return []
+
+
 class ChatSearcher:
     """Search and analyze Copilot chat backups."""
     
     def __init__(self, backup_path: Optional[Path] = None):
         self.backup_path = backup_path or DEFAULT_BACKUP_PATH
         self.index_file = self.backup_path / "index" / "master_index.json"
-        self.ai_export_file = self.backup_path / "ai-export" / "full_export.json"
+        self.ai_export_dir = self.backup_path / "ai-export"
         
         self.index = self._load_index()
         self.sessions = self._load_sessions()
@@ -49,11 +68,7 @@ class ChatSearcher:
     
     def _load_sessions(self) -> List[Dict]:
         """Load all session data."""
-        if self.ai_export_file.exists():
-            with open(self.ai_export_file, 'r') as f:
-                data = json.load(f)
-                return data.get('sessions', [])
-        return []
+        return load_export_sessions(self.ai_export_dir)
     
     def search(self, query: str, project: Optional[str] = None, 
                days: Optional[int] = None, limit: int = 20) -> List[Dict]:
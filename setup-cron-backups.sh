@@ -46,13 +46,13 @@ mkdir -p "$LOG_DIR"
 # Format: "schedule|description|command"
 CRON_JOBS=(
     # Hourly incremental backups during work hours (every 2 hours, 9 AM - 11 PM)
-    "0 9,11,13,15,17,19,21,23 * * *|Hourly incremental backup|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule hourly --incremental >> $LOG_DIR/hourly.log 2>&1"
+    "0 9,11,13,15,17,19,21,23 * * *|Hourly incremental backup|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule hourly --incremental --emit-jsonl >> $LOG_DIR/hourly.log 2>&1"
     
     # Daily full backup at 11:30 PM
-    "30 23 * * *|Daily full backup|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule daily >> $LOG_DIR/daily.log 2>&1"
+    "30 23 * * *|Daily full backup|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule daily --emit-jsonl >> $LOG_DIR/daily.log 2>&1"
     
     # Weekly archive on Sunday at 2 AM
-    "0 2 * * 0|Weekly archive|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule weekly >> $LOG_DIR/weekly.log 2>&1 && find $BACKUP_PATH/ai-export -name 'export_*.json' -mtime +30 -delete"
+    "0 2 * * 0|Weekly archive|cd $SCRIPT_DIR && $PYTHON_PATH $BACKUP_SCRIPT --schedule weekly --emit-jsonl >> $LOG_DIR/weekly.log 2>&1 && find $BACKUP_PATH/ai-export -name 'export_*.json*' -mtime +30 -delete"
 )
 
 install_cron() {
@@ -201,7 +201,7 @@ run_test() {
     
     # Run a quick backup
     cd "$SCRIPT_DIR"
-    $PYTHON_PATH "$BACKUP_SCRIPT" --schedule manual --incremental
+    $PYTHON_PATH "$BACKUP_SCRIPT" --schedule manual --incremental --emit-jsonl
     
     echo -e "\n${GREEN}✅ Test backup complete${NC}"
 }